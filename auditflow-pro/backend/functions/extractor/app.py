@@ -438,15 +438,17 @@ def extract_w2_data(kvs: Dict, blocks: List[Dict], document_id: str) -> W2Data:
     # Helper function to find field by key patterns
     def find_field(patterns: List[str], kvs: Dict, exclude_patterns: List[str] = None) -> Optional[Dict]:
         """Find a field by matching key patterns (case-insensitive), optionally excluding certain patterns."""
-        exclude_patterns = exclude_patterns or []
+        # Lowercase the patterns once per lookup rather than once per key
+        patterns = [pattern.lower() for pattern in patterns]
+        exclude_patterns = [excl.lower() for excl in exclude_patterns or []]
         for key, value_data in kvs.items():
             key_lower = key.lower()
             # Check if key should be excluded
-            if any(excl.lower() in key_lower for excl in exclude_patterns):
+            if any(excl in key_lower for excl in exclude_patterns):
                 continue
             # Check if key matches any pattern
             for pattern in patterns:
-                if pattern.lower() in key_lower:
+                if pattern in key_lower:
                     return value_data
         return None
     
@@ -604,15 +606,17 @@ def extract_bank_statement_data(kvs: Dict, blocks: List[Dict], document_id: str)
     # Helper function to find field by key patterns
     def find_field(patterns: List[str], kvs: Dict, exclude_patterns: List[str] = None) -> Optional[Dict]:
         """Find a field by matching key patterns (case-insensitive), optionally excluding certain patterns."""
-        exclude_patterns = exclude_patterns or []
+        # Lowercase the patterns once per lookup rather than once per key
+        patterns = [pattern.lower() for pattern in patterns]
+        exclude_patterns = [excl.lower() for excl in exclude_patterns or []]
         for key, value_data in kvs.items():
             key_lower = key.lower()
             # Check if key should be excluded
-            if any(excl.lower() in key_lower for excl in exclude_patterns):
+            if any(excl in key_lower for excl in exclude_patterns):
                 continue
             # Check if key matches any pattern
             for pattern in patterns:
-                if pattern.lower() in key_lower:
+                if pattern in key_lower:
                     return value_data
         return None
     
@@ -757,15 +761,17 @@ def extract_tax_form_data(kvs: Dict, blocks: List[Dict], document_id: str) -> Ta
     # Helper function to find field by key patterns
     def find_field(patterns: List[str], kvs: Dict, exclude_patterns: List[str] = None) -> Optional[Dict]:
         """Find a field by matching key patterns (case-insensitive), optionally excluding certain patterns."""
-        exclude_patterns = exclude_patterns or []
+        # Lowercase the patterns once per lookup rather than once per key
+        patterns = [pattern.lower() for pattern in patterns]
+        exclude_patterns = [excl.lower() for excl in exclude_patterns or []]
         for key, value_data in kvs.items():
             key_lower = key.lower()
             # Check if key should be excluded
-            if any(excl.lower() in key_lower for excl in exclude_patterns):
+            if any(excl in key_lower for excl in exclude_patterns):
                 continue
             # Check if key matches any pattern
             for pattern in patterns:
-                if pattern.lower() in key_lower:
+                if pattern in key_lower:
                     return value_data
         return None
     
@@ -936,15 +942,17 @@ def extract_drivers_license_data(kvs: Dict, blocks: List[Dict], document_id: str
     # Helper function to find field by key patterns
     def find_field(patterns: List[str], kvs: Dict, exclude_patterns: List[str] = None) -> Optional[Dict]:
         """Find a field by matching key patterns (case-insensitive), optionally excluding certain patterns."""
-        exclude_patterns = exclude_patterns or []
+        # Lowercase the patterns once per lookup rather than once per key
+        patterns = [pattern.lower() for pattern in patterns]
+        exclude_patterns = [excl.lower() for excl in exclude_patterns or []]
         for key, value_data in kvs.items():
             key_lower = key.lower()
             # Check if key should be excluded
-            if any(excl.lower() in key_lower for excl in exclude_patterns):
+            if any(excl in key_lower for excl in exclude_patterns):
                 continue
             # Check if key matches any pattern
             for pattern in patterns:
-                if pattern.lower() in key_lower:
+                if pattern in key_lower:
                     return value_data
         return None
     
@@ -1058,15 +1066,17 @@ def extract_id_document_data(kvs: Dict, blocks: List[Dict], document_id: str) ->
     # Helper function to find field by key patterns
     def find_field(patterns: List[str], kvs: Dict, exclude_patterns: List[str] = None) -> Optional[Dict]:
         """Find a field by matching key patterns (case-insensitive), optionally excluding certain patterns."""
-        exclude_patterns = exclude_patterns or []
+        # Lowercase the patterns once per lookup rather than once per key
+        patterns = [pattern.lower() for pattern in patterns]
+        exclude_patterns = [excl.lower() for excl in exclude_patterns or []]
         for key, value_data in kvs.items():
             key_lower = key.lower()
             # Check if key should be excluded
-            if any(excl.lower() in key_lower for excl in exclude_patterns):
+            if any(excl in key_lower for excl in exclude_patterns):
                 continue
             # Check if key matches any pattern
             for pattern in patterns:
-                if pattern.lower() in key_lower:
+                if pattern in key_lower:
                     return value_data
         return None
 
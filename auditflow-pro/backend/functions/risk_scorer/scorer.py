@@ -2,10 +2,31 @@
 # backend/functions/risk_scorer/scorer.py
 
 import logging
+from functools import lru_cache
 from typing import List, Dict, Tuple, Any
 
 logger = logging.getLogger(__name__)
 
+# Identity fields carry the maximum inconsistency penalty
+IDENTITY_FIELDS = frozenset(["ssn", "date_of_birth", "document_number"])
+
+@lru_cache(maxsize=256)
+def _inconsistency_points(field: str, severity: str) -> int:
+    """
+    Maps a (field, severity) pair to its point value.
+    Audits reuse a small set of field names, so the lookup is memoized.
+    """
+    # Point allocations based on requirements
+    if "name" in field:
+        return 15
+    if "address" in field:
+        return 20
+    if "income" in field:
+        return 25 if severity == "HIGH" else 15
+    if field in IDENTITY_FIELDS:
+        return 30
+    return 0
+
 def calculate_inconsistency_score(inconsistencies: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
     """
     Task 9.2: Implement inconsistency-based scoring.
@@ -20,17 +41,7 @@ def calculate_inconsistency_score(inconsistencies: List[Dict[str, Any]]) -> Tupl
         severity = inc.get("severity", "LOW")
         description = inc.get("description", "Unknown inconsistency")
         
-        points = 0
-        # Point allocations based on requirements
-        if "name" in field:
-            points = 15
-        elif "address" in field:
-            points = 20
-        elif "income" in field:
-            points = 25 if severity == "HIGH" else 15
-        elif field in ["ssn", "date_of_birth", "document_number"]:
-            points = 30
-            
+        points = _inconsistency_points(field, severity)
         if points > 0:
             score += points
             factors.append({
@@ -6,20 +6,56 @@ Implements the Lambda handler accepting multiple documents from a loan applicati
 and orchestrates the validation process to detect inconsistencies across documents.
 """
 
-import os
-import json
 import logging
 from typing import List, Dict, Any
 import uuid
+import traceback
+from datetime import datetime
+from functools import lru_cache
 
-from shared import repositories
 from shared.models import DocumentMetadata, ExtractedField, Inconsistency
 # from shared import models as shared_models
-import rules
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Extracted-data key holding the applicant's name for each document type
+NAME_FIELDS = {
+    'W2': 'employee_name',
+    'BANK_STATEMENT': 'account_holder_name',
+    'TAX_FORM': 'taxpayer_name',
+    'DRIVERS_LICENSE': 'full_name',
+    'ID_DOCUMENT': 'full_name',
+}
+
+# Extracted-data key holding the applicant's address for each document type
+ADDRESS_FIELDS = {
+    'W2': 'employee_address',
+    'BANK_STATEMENT': 'account_holder_address',
+    'TAX_FORM': 'address',
+    'DRIVERS_LICENSE': 'address',
+}
+
+# Extracted-data key holding the applicant's SSN for each document type
+SSN_FIELDS = {
+    'W2': 'employee_ssn',
+    'TAX_FORM': 'taxpayer_ssn',
+}
+
+
+class SimpleDoc:
+    """Attribute container for a Step Functions document passed to the validation rules."""
+    __slots__ = ('document_id', 'document_type', 'extracted_data', 'loan_application_id',
+                 'processing_status', 'file_name', 'classification_confidence')
+
+
+@lru_cache(maxsize=1)
+def _load_rules():
+    """Imports the validation rules on first use, so requests rejected during input
+    validation don't pay for loading them (and boto3) on a cold start."""
+    import rules
+    return rules
+
 
 def lambda_handler(event, context):
     """
@@ -77,9 +113,6 @@ def lambda_handler(event, context):
                         continue
                     
                     # Create a simple document object for validation
-                    class SimpleDoc:
-                        pass
-                    
                     simple_doc = SimpleDoc()
                     simple_doc.document_id = doc_id
                     simple_doc.document_type = doc_type
@@ -99,11 +132,8 @@ def lambda_handler(event, context):
             logger.error(f"No valid documents loaded for loan application {loan_application_id}")
             raise ValueError("No valid documents available for validation")
         
-        if not loaded_documents:
-            logger.error(f"No valid documents loaded for loan application {loan_application_id}")
-            raise ValueError("No valid documents available for validation")
-        
         logger.info(f"Successfully loaded {len(loaded_documents)} documents for validation")
+        rules = _load_rules()
         
         # Task 8.2: Perform name validation across all documents
         logger.info("Starting name validation across documents")
@@ -114,18 +144,9 @@ def lambda_handler(event, context):
             extracted_data = doc.extracted_data
             doc_id = doc.document_id
             
-            # Check for various name field types based on document type
-            name_value = None
-            if doc.document_type == 'W2' and 'employee_name' in extracted_data:
-                name_value = extracted_data['employee_name']
-            elif doc.document_type == 'BANK_STATEMENT' and 'account_holder_name' in extracted_data:
-                name_value = extracted_data['account_holder_name']
-            elif doc.document_type == 'TAX_FORM' and 'taxpayer_name' in extracted_data:
-                name_value = extracted_data['taxpayer_name']
-            elif doc.document_type == 'DRIVERS_LICENSE' and 'full_name' in extracted_data:
-                name_value = extracted_data['full_name']
-            elif doc.document_type == 'ID_DOCUMENT' and 'full_name' in extracted_data:
-                name_value = extracted_data['full_name']
+            # Look up the name field for this document type
+            name_key = NAME_FIELDS.get(doc.document_type)
+            name_value = extracted_data.get(name_key) if name_key else None
             
             # Add to name_fields list if found
             if name_value:
@@ -162,16 +183,9 @@ def lambda_handler(event, context):
             extracted_data = doc.extracted_data
             doc_id = doc.document_id
             
-            # Check for various address field types based on document type
-            address_value = None
-            if doc.document_type == 'W2' and 'employee_address' in extracted_data:
-                address_value = extracted_data['employee_address']
-            elif doc.document_type == 'BANK_STATEMENT' and 'account_holder_address' in extracted_data:
-                address_value = extracted_data['account_holder_address']
-            elif doc.document_type == 'TAX_FORM' and 'address' in extracted_data:
-                address_value = extracted_data['address']
-            elif doc.document_type == 'DRIVERS_LICENSE' and 'address' in extracted_data:
-                address_value = extracted_data['address']
+            # Look up the address field for this document type
+            address_key = ADDRESS_FIELDS.get(doc.document_type)
+            address_value = extracted_data.get(address_key) if address_key else None
             
             # Add to address_fields list if found
             if address_value:
@@ -383,12 +397,9 @@ def lambda_handler(event, context):
             extracted_data = doc.extracted_data
             doc_id = doc.document_id
             
-            # Check for various SSN field types based on document type
-            ssn_value = None
-            if doc.document_type == 'W2' and 'employee_ssn' in extracted_data:
-                ssn_value = extracted_data['employee_ssn']
-            elif doc.document_type == 'TAX_FORM' and 'taxpayer_ssn' in extracted_data:
-                ssn_value = extracted_data['taxpayer_ssn']
+            # Look up the SSN field for this document type
+            ssn_key = SSN_FIELDS.get(doc.document_type)
+            ssn_value = extracted_data.get(ssn_key) if ssn_key else None
             
             # Add to ssn_fields list if found
             if ssn_value:
@@ -432,7 +443,6 @@ def lambda_handler(event, context):
         
         # Task 8.7: Generate Golden Record
         logger.info("Generating Golden Record from all documents")
-        from datetime import datetime
         created_timestamp = datetime.utcnow().isoformat() + 'Z'
         
         golden_record_dict = rules.generate_golden_record(
@@ -483,7 +493,6 @@ def lambda_handler(event, context):
         }
     except Exception as e:
         logger.error(f"Unexpected error during validation: {str(e)}", exc_info=True)
-        import traceback
         error_trace = traceback.format_exc()
         logger.error(f"Full traceback: {error_trace}")
         return {
@@ -492,3 +501,8 @@ def lambda_handler(event, context):
             "message": f"An unexpected error occurred during validation: {str(e)}",
             "traceback": error_trace
         }
+    finally:
+        # The rules' caches hold this applicant's PII; never carry it into the next
+        # (unrelated) loan on a warm container
+        if _load_rules.cache_info().currsize:
+            _load_rules().clear_caches()
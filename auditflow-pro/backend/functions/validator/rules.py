@@ -2,8 +2,17 @@
 # backend/functions/validator/rules.py
 
 import json
-import boto3
 import logging
+import unicodedata
+from functools import lru_cache
+from operator import itemgetter
+
+try:
+    # C++ edit distance, bundled into the deployment package from requirements.txt;
+    # the pure-Python implementation below is the fallback where it isn't installed
+    from rapidfuzz.distance import Levenshtein as _rapidfuzz_levenshtein
+except ImportError:
+    _rapidfuzz_levenshtein = None
 
 logger = logging.getLogger(__name__)
 
@@ -14,35 +23,153 @@ def get_bedrock_client():
     """Get or create Bedrock client (lazy initialization)."""
     global _bedrock_client
     if _bedrock_client is None:
+        # boto3 is only needed once a semantic check reaches Bedrock, so the rules
+        # stay importable without paying for its import on the cold start
+        import boto3
         _bedrock_client = boto3.client('bedrock-runtime', region_name='ap-south-1')
     return _bedrock_client
 
 def levenshtein_distance(s1: str, s2: str) -> int:
     """Calculates the minimum number of single-character edits between two strings."""
-    if len(s1) < len(s2): return levenshtein_distance(s2, s1)
-    if len(s2) == 0: return len(s1)
-    
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-    return previous_row[-1]
+    if s1 == s2:
+        return 0
+    if _rapidfuzz_levenshtein is not None:
+        return _rapidfuzz_levenshtein.distance(s1, s2)
+    return _levenshtein_distance_py(s1, s2)
+
+def _levenshtein_distance_py(s1: str, s2: str) -> int:
+    """
+    Pure-Python Levenshtein distance, used when rapidfuzz is not installed.
+    Uses Myers' bit-parallel algorithm (Hyyro's formulation): each DP column is held
+    as bit vectors in an int, so every character of s2 costs a few bitwise ops
+    instead of len(s1) Python-level cell updates.
+    """
+    # A shared prefix or suffix never adds edits; peeling it off (e.g. "john a doe"
+    # vs "john b doe" leaves "a" vs "b") shortens the loop below
+    n = min(len(s1), len(s2))
+    start = 0
+    while start < n and s1[start] == s2[start]:
+        start += 1
+    end = 0
+    while end < n - start and s1[-1 - end] == s2[-1 - end]:
+        end += 1
+    s1 = s1[start:len(s1) - end]
+    s2 = s2[start:len(s2) - end]
+
+    if not s1: return len(s2)
+    if not s2: return len(s1)
+    # The loop below runs once per character of s2 while the bit vectors span s1;
+    # Python ints make wide vectors nearly free, so the longer string is the pattern
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+
+    # Bitmask of the positions of each character in s1
+    peq = {}
+    bit = 1
+    for c in s1:
+        peq[c] = peq.get(c, 0) | bit
+        bit <<= 1
+    mask = bit - 1
+    last = 1 << (len(s1) - 1)
+
+    vp, vn, score = mask, 0, len(s1)
+    for c in s2:
+        eq = peq.get(c, 0)
+        d0 = ((((eq & vp) + vp) ^ vp) | eq | vn) & mask
+        hp = vn | (~(d0 | vp) & mask)
+        hn = d0 & vp
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | (~(d0 | hp) & mask)
+        vn = hp & d0
+    return score
+
+# Names further apart than this many single-character edits are flagged
+NAME_MAX_EDIT_DISTANCE = 2
+
+def levenshtein_distance_bounded(s1: str, s2: str, max_dist: int = NAME_MAX_EDIT_DISTANCE) -> int:
+    """
+    Levenshtein distance for threshold checks: exact up to max_dist, otherwise max_dist + 1.
+    Identical strings and pairs whose lengths differ by more than max_dist are answered
+    without computing anything.
+    """
+    if s1 == s2:
+        return 0
+    if abs(len(s1) - len(s2)) > max_dist:
+        return max_dist + 1
+    # Distance is symmetric, so (a, b) and (b, a) share one cache entry
+    if s2 < s1:
+        s1, s2 = s2, s1
+    return _bounded_distance_cached(s1, s2, max_dist)
+
+@lru_cache(maxsize=4096)
+def _bounded_distance_cached(s1: str, s2: str, max_dist: int) -> int:
+    """Memoized core of levenshtein_distance_bounded; the same applicant names recur
+    across documents. Cleared after every invocation by clear_caches()."""
+    if _rapidfuzz_levenshtein is not None:
+        # rapidfuzz stops early once the cutoff is exceeded and returns max_dist + 1
+        return _rapidfuzz_levenshtein.distance(s1, s2, score_cutoff=max_dist)
+    return min(_levenshtein_distance_py(s1, s2), max_dist + 1)
+
+def _normalize_name(value: str) -> str:
+    """Case-folds a name, drops accents ("José" -> "jose") and collapses all whitespace
+    runs to single spaces. Non-Latin letters are kept as they are."""
+    value = unicodedata.normalize('NFKD', value)
+    if not value.isascii():
+        # Only marks on Latin letters are accents to drop; kana voicing marks and the
+        # like change the letter, so they are kept and recomposed (as are Hangul jamo)
+        kept = []
+        base = ''
+        for c in value:
+            if not unicodedata.combining(c):
+                base = c
+            elif base < '\u0250':  # end of the Latin Extended blocks
+                continue
+            kept.append(c)
+        value = unicodedata.normalize('NFC', "".join(kept))
+    return " ".join(value.casefold().split())
 
 def validate_names(names: list) -> list:
     """Task 8.2: Flags inconsistencies with edit distance > 2 characters."""
     inconsistencies = []
+    # Normalize each name exactly once, up front
+    keys = [_normalize_name(n['value']) for n in names]
+
+    # Names sharing a normalized form never mismatch, so edit distance is only
+    # computed once per pair of distinct forms rather than once per document pair.
+    # group[i] indexes names[i]'s normalized form in distinct (like np.unique's inverse).
+    group_ids = {}
+    group = [group_ids.setdefault(k, len(group_ids)) for k in keys]
+    distinct = list(group_ids)
+    if len(distinct) < 2:
+        return inconsistencies
+
+    # Deciding whether to flag only needs "within the threshold or not", so that check
+    # is bounded; the exact distance is computed only for flagged pairs, for the report.
+    # mismatch[a][b] holds that distance, or 0 when the pair is not flagged.
+    mismatch = [[0] * len(distinct) for _ in distinct]
+    any_mismatch = False
+    for a in range(len(distinct)):
+        for b in range(a + 1, len(distinct)):
+            dist = levenshtein_distance_bounded(distinct[a], distinct[b], NAME_MAX_EDIT_DISTANCE)
+            if dist > NAME_MAX_EDIT_DISTANCE:
+                mismatch[a][b] = mismatch[b][a] = levenshtein_distance(distinct[a], distinct[b])
+                any_mismatch = True
+
+    # Every distinct form is within the threshold of every other (e.g. only minor
+    # typos), so the per-document pair scan below would find nothing
+    if not any_mismatch:
+        return inconsistencies
+
     for i in range(len(names)):
+        row = mismatch[group[i]]
         for j in range(i + 1, len(names)):
-            # Normalize names: lowercase and strip whitespace
-            name1 = names[i]['value'].lower().strip()
-            name2 = names[j]['value'].lower().strip()
-            dist = levenshtein_distance(name1, name2)
-            if dist > 2:
+            dist = row[group[j]]
+            if dist:
                 inconsistencies.append({
                     "field": "name",
                     "severity": "HIGH",
@@ -71,6 +198,13 @@ def validate_ssn_dob(values: list, field_name: str) -> list:
             })
     return inconsistencies
 
+def _parse_money(value) -> float:
+    """Parses an extracted amount such as 75000.0 or "$75,000.00" into a float."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    # Chained str.replace beats a regex or str.translate on strings this short
+    return float(str(value).replace(',', '').replace('$', ''))
+
 def validate_income(w2_wages: list, tax_agi: dict) -> list:
     """Task 8.4: Compare summed W2 wages with Tax Form AGI (> 5% discrepancy)."""
     inconsistencies = []
@@ -78,8 +212,8 @@ def validate_income(w2_wages: list, tax_agi: dict) -> list:
 
     try:
         # Sum multiple W2s
-        total_w2_income = sum([float(str(w['value']).replace(',', '').replace('$', '')) for w in w2_wages])
-        agi_value = float(str(tax_agi['value']).replace(',', '').replace('$', ''))
+        total_w2_income = sum(_parse_money(w['value']) for w in w2_wages)
+        agi_value = _parse_money(tax_agi['value'])
         
         difference = abs(total_w2_income - agi_value)
         discrepancy_percentage = (difference / max(total_w2_income, 1)) * 100
@@ -99,32 +233,55 @@ def validate_income(w2_wages: list, tax_agi: dict) -> list:
         
     return inconsistencies
 
+# Bedrock model used for semantic address reasoning
+BEDROCK_MODEL_ID = 'anthropic.claude-sonnet-4-20250514-v1:0'  # Using Claude Sonnet 4 for advanced reasoning
+
+@lru_cache(maxsize=10000)
+def _bedrock_yes_no(prompt: str) -> bool:
+    """
+    Asks Bedrock a YES/NO question. Answers are memoized per prompt, since the same
+    address pairs recur across documents; failures raise and are therefore never
+    cached. Cleared after every invocation by clear_caches().
+    """
+    return _invoke_bedrock(prompt, max_tokens=10).strip().upper() == "YES"
+
+def clear_caches():
+    """Drops the memoized name distances and Bedrock answers. Both are keyed on applicant
+    names and addresses, so they must not outlive the invocation that filled them."""
+    _bounded_distance_cached.cache_clear()
+    _bedrock_yes_no.cache_clear()
+
+def _invoke_bedrock(prompt: str, max_tokens: int) -> str:
+    """Sends a single-turn prompt to the Bedrock model and returns the text of its reply."""
+    bedrock = get_bedrock_client()
+    response = bedrock.invoke_model(
+        modelId=BEDROCK_MODEL_ID,
+        contentType='application/json',
+        accept='application/json',
+        body=json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        })
+    )
+    result = json.loads(response['body'].read())
+    return result['content'][0]['text']
+
 def semantic_address_check(address1: str, address2: str) -> bool:
     """Task 8.6: Use AWS Bedrock Claude 3 to reason about address equivalents."""
+    # The question is symmetric; a fixed order lets (a, b) and (b, a) share a cached answer
+    first, second = sorted((address1, address2))
     prompt = f"""
     Human: You are a strict data validation assistant. 
     Are these two addresses semantically pointing to the exact same location despite abbreviations or formatting differences?
-    Address 1: {address1}
-    Address 2: {address2}
+    Address 1: {first}
+    Address 2: {second}
     Respond ONLY with "YES" or "NO".
     Assistant:
     """
     
     try:
-        bedrock = get_bedrock_client()
-        response = bedrock.invoke_model(
-            modelId='anthropic.claude-sonnet-4-20250514-v1:0', # Using Claude Sonnet 4 for advanced reasoning
-            contentType='application/json',
-            accept='application/json',
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 10,
-                "messages": [{"role": "user", "content": prompt}]
-            })
-        )
-        result = json.loads(response['body'].read())
-        answer = result['content'][0]['text'].strip().upper()
-        return answer == "YES"
+        return _bedrock_yes_no(prompt)
     except Exception as e:
         logger.error(f"Bedrock invocation failed: {str(e)}")
         # Fallback to basic string comparison if AI fails
@@ -193,7 +350,10 @@ def semantic_component_match(component1: str, component2: str, component_type: s
     if c1_normalized == c2_normalized:
         return True
     
-    # Use Bedrock for semantic comparison to handle abbreviations
+    # Use Bedrock for semantic comparison to handle abbreviations; the question is
+    # symmetric, so a fixed order lets (a, b) and (b, a) share a cached answer
+    if c2_normalized < c1_normalized:
+        component1, component2 = component2, component1
     prompt = f"""
     Human: You are a strict address validation assistant.
     Are these two {component_type} components semantically equivalent despite abbreviations or formatting differences?
@@ -210,25 +370,74 @@ def semantic_component_match(component1: str, component2: str, component_type: s
     """
     
     try:
-        bedrock = get_bedrock_client()
-        response = bedrock.invoke_model(
-            modelId='anthropic.claude-sonnet-4-20250514-v1:0', # Using Claude Sonnet 4 for advanced reasoning
-            contentType='application/json',
-            accept='application/json',
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 10,
-                "messages": [{"role": "user", "content": prompt}]
-            })
-        )
-        result = json.loads(response['body'].read())
-        answer = result['content'][0]['text'].strip().upper()
-        return answer == "YES"
+        return _bedrock_yes_no(prompt)
     except Exception as e:
         logger.error(f"Bedrock invocation failed for component matching: {str(e)}")
         # Fallback to exact match if AI fails
         return c1_normalized == c2_normalized
 
+def semantic_component_match_batch(pairs: list) -> list:
+    """
+    Task 8.6: Batched semantic_component_match over (component1, component2, component_type)
+    triples, returning one bool per triple. Pairs that match after normalization are
+    answered locally and the remaining distinct questions share a single Bedrock call;
+    if the batched reply is unusable, each question falls back to semantic_component_match.
+    """
+    results = [None] * len(pairs)
+    # Distinct questions (ignoring case and order) -> indexes of the pairs asking them
+    questions = {}
+    for idx, (component1, component2, component_type) in enumerate(pairs):
+        if not component1 or not component2:
+            results[idx] = component1 == component2
+            continue
+        c1_normalized = component1.lower().strip()
+        c2_normalized = component2.lower().strip()
+        if c1_normalized == c2_normalized:
+            results[idx] = True
+        else:
+            key = (component_type,) + tuple(sorted((c1_normalized, c2_normalized)))
+            questions.setdefault(key, []).append(idx)
+    
+    if not questions:
+        return results
+    
+    keys = list(questions)
+    if len(keys) == 1:
+        # A single question gains nothing from batching and can use the memoized path
+        answers = [semantic_component_match(*pairs[questions[keys[0]][0]])]
+    else:
+        numbered = "\n    ".join(
+            f"{n}. {component_type}: \"{c1}\" vs \"{c2}\""
+            for n, (component_type, c1, c2) in enumerate(keys, 1)
+        )
+        prompt = f"""
+    Human: You are a strict address validation assistant.
+    For each numbered pair below, decide whether the two address components are semantically
+    equivalent despite abbreviations or formatting differences.
+    {numbered}
+    
+    Consider common abbreviations like:
+    - Street/St/St., Avenue/Ave/Ave., Road/Rd/Rd., Boulevard/Blvd/Blvd.
+    - Drive/Dr/Dr., Lane/Ln/Ln., Court/Ct/Ct., Place/Pl/Pl.
+    - North/N, South/S, East/E, West/W
+    
+    Respond ONLY with a JSON array of {len(keys)} strings, "YES" or "NO", in the same order.
+    Assistant:
+    """
+        try:
+            reply = json.loads(_invoke_bedrock(prompt, max_tokens=8 * len(keys) + 10))
+            if not isinstance(reply, list) or len(reply) != len(keys):
+                raise ValueError(f"expected {len(keys)} answers, got {reply!r}")
+            answers = [str(answer).strip().upper() == "YES" for answer in reply]
+        except Exception as e:
+            logger.error(f"Batched Bedrock component matching failed, checking pairs individually: {str(e)}")
+            answers = [semantic_component_match(*pairs[questions[key][0]]) for key in keys]
+    
+    for key, answer in zip(keys, answers):
+        for idx in questions[key]:
+            results[idx] = answer
+    return results
+
 def validate_addresses(addresses: list) -> list:
     """
     Task 8.3 & 8.6: Parse addresses into components and compare each component.
@@ -241,21 +450,34 @@ def validate_addresses(addresses: list) -> list:
     """
     inconsistencies = []
     
+    # Parse each address into components once
+    parsed = [parse_address_components(address['value']) for address in addresses]
+    
+    # Street, city and state may differ only in formatting, so every such comparison
+    # across all address pairs is collected first and sent to Bedrock in one batch
+    comparisons = {}
+    for i in range(len(addresses)):
+        for j in range(i + 1, len(addresses)):
+            for component_type in ('street', 'city', 'state'):
+                component1 = parsed[i][component_type]
+                component2 = parsed[j][component_type]
+                if component1 and component2:
+                    comparisons.setdefault((component1, component2, component_type), None)
+    matches = dict(zip(comparisons, semantic_component_match_batch(list(comparisons))))
+    
     for i in range(len(addresses)):
         for j in range(i + 1, len(addresses)):
             addr1 = addresses[i]['value']
             addr2 = addresses[j]['value']
-            
-            # Parse both addresses into components
-            components1 = parse_address_components(addr1)
-            components2 = parse_address_components(addr2)
+            components1 = parsed[i]
+            components2 = parsed[j]
             
             # Track which components don't match
             mismatched_components = []
             
             # Compare street component
             if components1['street'] and components2['street']:
-                if not semantic_component_match(components1['street'], components2['street'], 'street'):
+                if not matches[(components1['street'], components2['street'], 'street')]:
                     mismatched_components.append(f"street ('{components1['street']}' vs '{components2['street']}')")
             elif components1['street'] != components2['street']:
                 # One is None and the other isn't
@@ -263,14 +485,14 @@ def validate_addresses(addresses: list) -> list:
             
             # Compare city component
             if components1['city'] and components2['city']:
-                if not semantic_component_match(components1['city'], components2['city'], 'city'):
+                if not matches[(components1['city'], components2['city'], 'city')]:
                     mismatched_components.append(f"city ('{components1['city']}' vs '{components2['city']}')")
             elif components1['city'] != components2['city']:
                 mismatched_components.append(f"city ('{components1['city']}' vs '{components2['city']}')")
             
             # Compare state component
             if components1['state'] and components2['state']:
-                if not semantic_component_match(components1['state'], components2['state'], 'state'):
+                if not matches[(components1['state'], components2['state'], 'state')]:
                     mismatched_components.append(f"state ('{components1['state']}' vs '{components2['state']}')")
             elif components1['state'] != components2['state']:
                 mismatched_components.append(f"state ('{components1['state']}' vs '{components2['state']}')")
@@ -298,6 +520,116 @@ def validate_addresses(addresses: list) -> list:
     
     return inconsistencies
 
+# Golden Record source reliability: Government ID > Tax Forms > W2 > Bank Statements
+RELIABILITY_HIERARCHY = {
+    'DRIVERS_LICENSE': 4,
+    'ID_DOCUMENT': 4,
+    'TAX_FORM': 3,
+    'W2': 2,
+    'BANK_STATEMENT': 1
+}
+
+# Golden Record fields, in the order they are emitted
+GOLDEN_RECORD_FIELDS = (
+    'name', 'date_of_birth', 'ssn', 'address', 'employer', 'employer_ein', 'annual_income',
+    'bank_account', 'ending_balance', 'drivers_license_number', 'drivers_license_state'
+)
+
+# Extracted-data keys feeding Golden Record fields, per document type. Date of birth
+# is taken from any document type that carries it.
+_COMMON_GOLDEN_RECORD_SOURCES = (('date_of_birth', 'date_of_birth'),)
+GOLDEN_RECORD_SOURCES = {
+    doc_type: sources + _COMMON_GOLDEN_RECORD_SOURCES
+    for doc_type, sources in {
+        'W2': (('employee_name', 'name'), ('employee_ssn', 'ssn'), ('employee_address', 'address'),
+               ('employer_name', 'employer'), ('employer_ein', 'employer_ein'),
+               ('wages', 'annual_income')),
+        'BANK_STATEMENT': (('account_holder_name', 'name'), ('account_holder_address', 'address'),
+                           ('account_number', 'bank_account'), ('ending_balance', 'ending_balance')),
+        'TAX_FORM': (('taxpayer_name', 'name'), ('taxpayer_ssn', 'ssn'), ('address', 'address'),
+                     ('adjusted_gross_income', 'annual_income')),
+        'DRIVERS_LICENSE': (('full_name', 'name'), ('address', 'address'),
+                            ('license_number', 'drivers_license_number'),
+                            ('state', 'drivers_license_state')),
+        'ID_DOCUMENT': (('full_name', 'name'),),
+    }.items()
+}
+
+# Candidates rank by reliability, then confidence; itemgetter builds the key tuple in C
+_candidate_rank = itemgetter('reliability', 'confidence')
+
+def get_reliability(doc_type: str) -> int:
+    """Get reliability score for a document type."""
+    return RELIABILITY_HIERARCHY.get(doc_type, 0)
+
+def extract_field_value(field_data):
+    """Extract value and confidence from field data (handles dict and object formats)."""
+    if field_data is None:
+        return None, 0.0
+    
+    if isinstance(field_data, dict):
+        value = field_data.get('value')
+        confidence = field_data.get('confidence', 0.0)
+    elif hasattr(field_data, 'value'):
+        value = field_data.value
+        confidence = getattr(field_data, 'confidence', 0.0)
+    else:
+        value = str(field_data)
+        confidence = 1.0
+    
+    return value, float(confidence) if confidence else 0.0
+
+def select_best_value(candidates: list) -> dict:
+    """
+    Select the best value from candidates based on reliability and confidence.
+    
+    Args:
+        candidates: List of dicts with keys: value, source_document, confidence, reliability, doc_type
+    
+    Returns:
+        Dict with: value, source_document, confidence, alternative_values, verified_by
+    """
+    if not candidates:
+        return None
+
+    # A field seen in one document has nothing to rank against
+    if len(candidates) == 1:
+        best = candidates[0]
+        return {
+            'value': best['value'],
+            'source_document': best['source_document'],
+            'confidence': best['confidence'],
+            'alternative_values': [],
+            'verified_by': []
+        }
+
+    # Sort by reliability (descending), then by confidence (descending); the sort is
+    # stable, so equally ranked candidates keep document order
+    sorted_candidates = sorted(candidates, key=_candidate_rank, reverse=True)
+    
+    # Best candidate is the first one
+    best = sorted_candidates[0]
+    
+    # Collect alternative values (excluding the best one)
+    alternative_values = []
+    verified_by = []
+    
+    for candidate in sorted_candidates[1:]:
+        # Only add as alternative if the value is different
+        if candidate['value'] != best['value']:
+            alternative_values.append(candidate['value'])
+        else:
+            # Same value from different source - add to verified_by
+            verified_by.append(candidate['source_document'])
+    
+    return {
+        'value': best['value'],
+        'source_document': best['source_document'],
+        'confidence': best['confidence'],
+        'alternative_values': alternative_values,
+        'verified_by': verified_by
+    }
+
 def generate_golden_record(loan_application_id: str, documents: list, created_timestamp: str) -> dict:
     """
     Task 8.7: Generate Golden Record by selecting the most reliable value for each field.
@@ -319,93 +651,8 @@ def generate_golden_record(loan_application_id: str, documents: list, created_ti
     Returns:
         Dictionary representing the GoldenRecord with consolidated data
     """
-    from datetime import datetime
-    
-    # Define reliability hierarchy
-    RELIABILITY_HIERARCHY = {
-        'DRIVERS_LICENSE': 4,
-        'ID_DOCUMENT': 4,
-        'TAX_FORM': 3,
-        'W2': 2,
-        'BANK_STATEMENT': 1
-    }
-    
-    def get_reliability(doc_type: str) -> int:
-        """Get reliability score for a document type."""
-        return RELIABILITY_HIERARCHY.get(doc_type, 0)
-    
-    def extract_field_value(field_data):
-        """Extract value and confidence from field data (handles dict and object formats)."""
-        if field_data is None:
-            return None, 0.0
-        
-        if isinstance(field_data, dict):
-            value = field_data.get('value')
-            confidence = field_data.get('confidence', 0.0)
-        elif hasattr(field_data, 'value'):
-            value = field_data.value
-            confidence = getattr(field_data, 'confidence', 0.0)
-        else:
-            value = str(field_data)
-            confidence = 1.0
-        
-        return value, float(confidence) if confidence else 0.0
-    
-    def select_best_value(candidates: list) -> dict:
-        """
-        Select the best value from candidates based on reliability and confidence.
-        
-        Args:
-            candidates: List of dicts with keys: value, source_document, confidence, reliability, doc_type
-        
-        Returns:
-            Dict with: value, source_document, confidence, alternative_values, verified_by
-        """
-        if not candidates:
-            return None
-        
-        # Sort by reliability (descending), then by confidence (descending)
-        sorted_candidates = sorted(
-            candidates,
-            key=lambda x: (x['reliability'], x['confidence']),
-            reverse=True
-        )
-        
-        # Best candidate is the first one
-        best = sorted_candidates[0]
-        
-        # Collect alternative values (excluding the best one)
-        alternative_values = []
-        verified_by = []
-        
-        for candidate in sorted_candidates[1:]:
-            # Only add as alternative if the value is different
-            if candidate['value'] != best['value']:
-                alternative_values.append(candidate['value'])
-            else:
-                # Same value from different source - add to verified_by
-                verified_by.append(candidate['source_document'])
-        
-        return {
-            'value': best['value'],
-            'source_document': best['source_document'],
-            'confidence': best['confidence'],
-            'alternative_values': alternative_values,
-            'verified_by': verified_by
-        }
-    
-    # Initialize field collectors
-    name_candidates = []
-    dob_candidates = []
-    ssn_candidates = []
-    address_candidates = []
-    employer_candidates = []
-    employer_ein_candidates = []
-    annual_income_candidates = []
-    bank_account_candidates = []
-    ending_balance_candidates = []
-    drivers_license_number_candidates = []
-    drivers_license_state_candidates = []
+    # Candidate values for each Golden Record field, gathered in one pass over the documents
+    candidates = {field: [] for field in GOLDEN_RECORD_FIELDS}
     
     # Extract fields from all documents
     for doc in documents:
@@ -417,174 +664,16 @@ def generate_golden_record(loan_application_id: str, documents: list, created_ti
         if not extracted_data:
             continue
         
-        # Extract name field (varies by document type)
-        name_field = None
-        if doc_type == 'W2' and 'employee_name' in extracted_data:
-            name_field = extracted_data['employee_name']
-        elif doc_type == 'BANK_STATEMENT' and 'account_holder_name' in extracted_data:
-            name_field = extracted_data['account_holder_name']
-        elif doc_type == 'TAX_FORM' and 'taxpayer_name' in extracted_data:
-            name_field = extracted_data['taxpayer_name']
-        elif doc_type in ['DRIVERS_LICENSE', 'ID_DOCUMENT'] and 'full_name' in extracted_data:
-            name_field = extracted_data['full_name']
-        
-        if name_field:
-            value, confidence = extract_field_value(name_field)
-            if value:
-                name_candidates.append({
-                    'value': value,
-                    'source_document': doc_id,
-                    'confidence': confidence,
-                    'reliability': reliability,
-                    'doc_type': doc_type
-                })
-        
-        # Extract date of birth (from identification documents)
-        if 'date_of_birth' in extracted_data:
-            value, confidence = extract_field_value(extracted_data['date_of_birth'])
+        for source_key, field in GOLDEN_RECORD_SOURCES.get(doc_type, _COMMON_GOLDEN_RECORD_SOURCES):
+            value, confidence = extract_field_value(extracted_data.get(source_key))
             if value:
-                dob_candidates.append({
+                candidates[field].append({
                     'value': value,
                     'source_document': doc_id,
                     'confidence': confidence,
                     'reliability': reliability,
                     'doc_type': doc_type
                 })
-        
-        # Extract SSN
-        ssn_field = None
-        if doc_type == 'W2' and 'employee_ssn' in extracted_data:
-            ssn_field = extracted_data['employee_ssn']
-        elif doc_type == 'TAX_FORM' and 'taxpayer_ssn' in extracted_data:
-            ssn_field = extracted_data['taxpayer_ssn']
-        
-        if ssn_field:
-            value, confidence = extract_field_value(ssn_field)
-            if value:
-                ssn_candidates.append({
-                    'value': value,
-                    'source_document': doc_id,
-                    'confidence': confidence,
-                    'reliability': reliability,
-                    'doc_type': doc_type
-                })
-        
-        # Extract address (varies by document type)
-        address_field = None
-        if doc_type == 'W2' and 'employee_address' in extracted_data:
-            address_field = extracted_data['employee_address']
-        elif doc_type == 'BANK_STATEMENT' and 'account_holder_address' in extracted_data:
-            address_field = extracted_data['account_holder_address']
-        elif doc_type == 'TAX_FORM' and 'address' in extracted_data:
-            address_field = extracted_data['address']
-        elif doc_type == 'DRIVERS_LICENSE' and 'address' in extracted_data:
-            address_field = extracted_data['address']
-        
-        if address_field:
-            value, confidence = extract_field_value(address_field)
-            if value:
-                address_candidates.append({
-                    'value': value,
-                    'source_document': doc_id,
-                    'confidence': confidence,
-                    'reliability': reliability,
-                    'doc_type': doc_type
-                })
-        
-        # Extract employer information (from W2)
-        if doc_type == 'W2':
-            if 'employer_name' in extracted_data:
-                value, confidence = extract_field_value(extracted_data['employer_name'])
-                if value:
-                    employer_candidates.append({
-                        'value': value,
-                        'source_document': doc_id,
-                        'confidence': confidence,
-                        'reliability': reliability,
-                        'doc_type': doc_type
-                    })
-            
-            if 'employer_ein' in extracted_data:
-                value, confidence = extract_field_value(extracted_data['employer_ein'])
-                if value:
-                    employer_ein_candidates.append({
-                        'value': value,
-                        'source_document': doc_id,
-                        'confidence': confidence,
-                        'reliability': reliability,
-                        'doc_type': doc_type
-                    })
-            
-            if 'wages' in extracted_data:
-                value, confidence = extract_field_value(extracted_data['wages'])
-                if value:
-                    annual_income_candidates.append({
-                        'value': value,
-                        'source_document': doc_id,
-                        'confidence': confidence,
-                        'reliability': reliability,
-                        'doc_type': doc_type
-                    })
-        
-        # Extract income from tax form
-        if doc_type == 'TAX_FORM' and 'adjusted_gross_income' in extracted_data:
-            value, confidence = extract_field_value(extracted_data['adjusted_gross_income'])
-            if value:
-                annual_income_candidates.append({
-                    'value': value,
-                    'source_document': doc_id,
-                    'confidence': confidence,
-                    'reliability': reliability,
-                    'doc_type': doc_type
-                })
-        
-        # Extract bank account information (from bank statement)
-        if doc_type == 'BANK_STATEMENT':
-            if 'account_number' in extracted_data:
-                value, confidence = extract_field_value(extracted_data['account_number'])
-                if value:
-                    bank_account_candidates.append({
-                        'value': value,
-                        'source_document': doc_id,
-                        'confidence': confidence,
-                        'reliability': reliability,
-                        'doc_type': doc_type
-                    })
-            
-            if 'ending_balance' in extracted_data:
-                value, confidence = extract_field_value(extracted_data['ending_balance'])
-                if value:
-                    ending_balance_candidates.append({
-                        'value': value,
-                        'source_document': doc_id,
-                        'confidence': confidence,
-                        'reliability': reliability,
-                        'doc_type': doc_type
-                    })
-        
-        # Extract driver's license information
-        if doc_type == 'DRIVERS_LICENSE':
-            if 'license_number' in extracted_data:
-                value, confidence = extract_field_value(extracted_data['license_number'])
-                if value:
-                    drivers_license_number_candidates.append({
-                        'value': value,
-                        'source_document': doc_id,
-                        'confidence': confidence,
-                        'reliability': reliability,
-                        'doc_type': doc_type
-                    })
-            
-            if 'state' in extracted_data:
-                value, confidence = extract_field_value(extracted_data['state'])
-                if value:
-                    drivers_license_state_candidates.append({
-                        'value': value,
-                        'source_document': doc_id,
-                        'confidence': confidence,
-                        'reliability': reliability,
-                        'doc_type': doc_type
-                    })
     
     # Build Golden Record by selecting best value for each field
     golden_record = {
@@ -593,38 +682,9 @@ def generate_golden_record(loan_application_id: str, documents: list, created_ti
     }
     
     # Select best values for each field
-    if name_candidates:
-        golden_record['name'] = select_best_value(name_candidates)
-    
-    if dob_candidates:
-        golden_record['date_of_birth'] = select_best_value(dob_candidates)
-    
-    if ssn_candidates:
-        golden_record['ssn'] = select_best_value(ssn_candidates)
-    
-    if address_candidates:
-        golden_record['address'] = select_best_value(address_candidates)
-    
-    if employer_candidates:
-        golden_record['employer'] = select_best_value(employer_candidates)
-    
-    if employer_ein_candidates:
-        golden_record['employer_ein'] = select_best_value(employer_ein_candidates)
-    
-    if annual_income_candidates:
-        golden_record['annual_income'] = select_best_value(annual_income_candidates)
-    
-    if bank_account_candidates:
-        golden_record['bank_account'] = select_best_value(bank_account_candidates)
-    
-    if ending_balance_candidates:
-        golden_record['ending_balance'] = select_best_value(ending_balance_candidates)
-    
-    if drivers_license_number_candidates:
-        golden_record['drivers_license_number'] = select_best_value(drivers_license_number_candidates)
-    
-    if drivers_license_state_candidates:
-        golden_record['drivers_license_state'] = select_best_value(drivers_license_state_candidates)
+    for field in GOLDEN_RECORD_FIELDS:
+        if candidates[field]:
+            golden_record[field] = select_best_value(candidates[field])
     
     logger.info(f"Generated Golden Record for loan application {loan_application_id} with {len(golden_record) - 2} fields")
     
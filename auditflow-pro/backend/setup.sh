@@ -54,6 +54,9 @@ echo ""
 echo "To run tests, run:"
 echo "  pytest tests/"
 echo ""
+echo "To run tests in parallel across all cores (pytest-xdist), run:"
+echo "  pytest tests/ -n auto --dist=loadfile"
+echo ""
 echo "To deactivate the virtual environment, run:"
 echo "  deactivate"
 echo "================================================"
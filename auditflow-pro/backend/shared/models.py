@@ -1,18 +1,47 @@
 # -*- coding: utf-8 -*-
+import sys
 import json
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional, Any, Type, TypeVar
+from typing import List, Dict, Optional, Any, Type, TypeVar, ClassVar
 from datetime import datetime
+from enum import IntEnum
+from functools import lru_cache
 
 T = TypeVar('T')
 
-@dataclass
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__ for the
+# high-volume models below; older interpreters fall back to regular dataclasses.
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Stored confidences are only ever compared against review thresholds, so three
+# decimal places (about what a half-precision float holds) is plenty. Quantizing
+# keeps the stored DynamoDB numbers short instead of carrying ~17 significant digits.
+# The review threshold itself is checked against the raw value, before quantizing.
+CONFIDENCE_DECIMALS = 3
+
+def quantize_confidence(confidence: Optional[float]) -> Optional[float]:
+    """Rounds a float confidence to CONFIDENCE_DECIMALS; None and Decimals pass through."""
+    if isinstance(confidence, float):
+        return round(confidence, CONFIDENCE_DECIMALS)
+    return confidence
+
+@dataclass(**_SLOTS)
 class ExtractedField:
     """Represents a single extracted field with confidence tracking."""
+    REVIEW_THRESHOLD: ClassVar[float] = 0.80
+
     value: Any
     confidence: Optional[float] = None
     requires_manual_review: bool = False
 
+    def __post_init__(self):
+        """Flag low-confidence fields for manual review (an explicit True is preserved),
+        then quantize the stored confidence."""
+        self.requires_manual_review = self.requires_manual_review or (
+            self.confidence is not None and self.confidence < self.REVIEW_THRESHOLD
+        )
+        self.confidence = quantize_confidence(self.confidence)
+
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
         return {
@@ -26,6 +55,13 @@ class ExtractedField:
         """Create ExtractedField from dictionary."""
         return cls(**data)
 
+    @classmethod
+    def from_arrays(cls, values: List[Any], confidences: List[Optional[float]]) -> List['ExtractedField']:
+        """Build ExtractedFields from parallel value and confidence columns."""
+        if len(values) != len(confidences):
+            raise ValueError(f"values and confidences differ in length ({len(values)} != {len(confidences)})")
+        return [cls(value, confidence) for value, confidence in zip(values, confidences)]
+
 # --- Document Specific Schemas ---
 
 @dataclass
@@ -224,7 +260,7 @@ class IDDocumentData:
 
 # --- Core Metadata and Audit Models ---
 
-@dataclass
+@dataclass(**_SLOTS)
 class DocumentMetadata:
     """Document metadata with extracted data and processing status."""
     document_id: str
@@ -249,6 +285,10 @@ class DocumentMetadata:
     encryption_key_id: Optional[str] = None
     ttl: Optional[int] = None
 
+    def __post_init__(self):
+        """Quantize the classification confidence like ExtractedField confidences."""
+        self.classification_confidence = quantize_confidence(self.classification_confidence)
+
     def to_json(self) -> str:
         """Serialize to JSON string."""
         data = asdict(self)
@@ -361,12 +401,27 @@ class GoldenRecord:
         """Deserialize from JSON string."""
         return cls.from_dict(json.loads(json_str))
 
-@dataclass
+class Severity(IntEnum):
+    """Inconsistency severity, ordered so filtering and sorting are plain int compares."""
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+    CRITICAL = 3
+
+@lru_cache(maxsize=16)
+def _coerce_severity(value) -> Severity:
+    """Maps a severity name (any case) or numeric level to its Severity member; memoized
+    because batches of inconsistencies repeat the same few values."""
+    if isinstance(value, str):
+        return Severity[value.strip().upper()]
+    return Severity(value)
+
+@dataclass(**_SLOTS)
 class Inconsistency:
     """Represents a data inconsistency detected across documents."""
     inconsistency_id: str
     field: str
-    severity: str  # CRITICAL, HIGH, MEDIUM, LOW
+    severity: Severity
     expected_value: Any
     actual_value: Any
     source_documents: List[str]
@@ -374,9 +429,16 @@ class Inconsistency:
     detected_by: str
     document_pages: List[Dict[str, Any]] = field(default_factory=list)
 
+    def __post_init__(self):
+        """Coerce severity names (e.g. "CRITICAL") or levels to Severity members."""
+        if not isinstance(self.severity, Severity):
+            self.severity = _coerce_severity(self.severity)
+
     def to_dict(self) -> dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """Convert to dictionary, keeping severity as its name for storage and the API."""
+        result = asdict(self)
+        result['severity'] = self.severity.name
+        return result
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Inconsistency':
@@ -17,6 +17,22 @@ MAX_RETRIES = 3
 INITIAL_BACKOFF = 0.1  # 100ms
 MAX_BACKOFF = 2.0  # 2 seconds
 
+# Confidences are rounded to two decimal places upstream, so the common values
+# are built once instead of re-parsing the digit string on every write. Each value
+# is keyed both as written ("0.50") and as str() renders the float ("0.5"), and
+# maps to the Decimal that key would parse to.
+_DECIMAL_CACHE = {}
+for _x in range(101):
+    for _key in (f"{_x / 100:.2f}", str(_x / 100)):
+        _DECIMAL_CACHE[_key] = Decimal(_key)
+del _x, _key
+
+def to_decimal(value) -> Decimal:
+    """Converts a number to a DynamoDB-compatible Decimal, reusing cached confidence values."""
+    key = value if isinstance(value, str) else str(value)
+    cached = _DECIMAL_CACHE.get(key)
+    return cached if cached is not None else Decimal(key)
+
 class DocumentRepository:
     def __init__(self, dynamodb_resource=None):
         self.dynamodb = dynamodb_resource or boto3.resource('dynamodb')
@@ -63,6 +79,46 @@ class DocumentRepository:
             logger.error(f"Error retrieving document {document_id}: {e.response['Error']['Message']}")
             raise
 
+    def get_documents(self, document_ids: List[str]) -> List[models.DocumentMetadata]:
+        """
+        Retrieves multiple documents with BatchGetItem, one round trip per 100 keys.
+        Documents are returned in the order requested; IDs that do not exist are skipped.
+        """
+        if not document_ids:
+            return []
+        
+        try:
+            # DynamoDB batch_get_item has a limit of 100 items
+            batch_size = 100
+            unique_ids = list(dict.fromkeys(document_ids))
+            items_by_id = {}
+            
+            for i in range(0, len(unique_ids), batch_size):
+                keys = [{'document_id': did} for did in unique_ids[i:i + batch_size]]
+                request_items = {self.table_name: {'Keys': keys}}
+                backoff = INITIAL_BACKOFF
+                
+                # Retry any keys DynamoDB could not serve in this round, backing off
+                # exponentially since unprocessed keys usually mean throttling
+                while request_items:
+                    response = self._retry_with_backoff(
+                        self.dynamodb.batch_get_item,
+                        RequestItems=request_items
+                    )
+                    for item in response.get('Responses', {}).get(self.table_name, []):
+                        items_by_id[item['document_id']] = item
+                    request_items = response.get('UnprocessedKeys', {})
+                    if request_items:
+                        logger.warning(f"Retrying {len(request_items[self.table_name]['Keys'])} unprocessed document keys")
+                        time.sleep(backoff)
+                        backoff = min(backoff * 2, MAX_BACKOFF)
+            
+            return [models.DocumentMetadata.from_dict(items_by_id[did])
+                    for did in document_ids if did in items_by_id]
+        except ClientError as e:
+            logger.error(f"Error in batch get documents: {e.response['Error']['Message']}")
+            raise
+
     def update_document_status(self, document_id: str, new_status: str) -> bool:
         """Atomically updates the processing status of a document."""
         try:
@@ -117,7 +173,7 @@ class DocumentRepository:
                 ConditionExpression="attribute_exists(document_id)",
                 ExpressionAttributeValues={
                     ':dt': document_type,
-                    ':conf': Decimal(str(confidence)),
+                    ':conf': to_decimal(confidence),
                     ':rmr': requires_manual_review
                 }
             )
@@ -222,6 +278,23 @@ class AuditRecordRepository:
             logger.error(f"Error retrieving audit record {audit_record_id}: {e.response['Error']['Message']}")
             raise
 
+    def get_audit_field(self, audit_record_id: str, field_name: str) -> Optional[Any]:
+        """Retrieves a single attribute of an audit record without loading the full item."""
+        try:
+            response = self._retry_with_backoff(
+                self.table.get_item,
+                Key={'audit_record_id': audit_record_id},
+                ProjectionExpression="#f",
+                ExpressionAttributeNames={'#f': field_name}
+            )
+            item = response.get('Item')
+            if item:
+                return item.get(field_name)
+            return None
+        except ClientError as e:
+            logger.error(f"Error retrieving {field_name} for audit record {audit_record_id}: {e.response['Error']['Message']}")
+            raise
+
     def update_audit_status(self, audit_record_id: str, new_status: str) -> bool:
         """Atomically updates the status of an audit record."""
         try:
@@ -405,9 +478,11 @@ class AuditRecordRepository:
                 
                 # Handle unprocessed keys
                 unprocessed = response.get('UnprocessedKeys', {})
+                backoff = INITIAL_BACKOFF
                 while unprocessed:
                     logger.warning(f"Retrying {len(unprocessed)} unprocessed keys")
-                    time.sleep(INITIAL_BACKOFF)
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, MAX_BACKOFF)
                     response = self._retry_with_backoff(
                         self.dynamodb.batch_get_item,
                         RequestItems=unprocessed
@@ -1,67 +1,198 @@
 # -*- coding: utf-8 -*-
 import os
+import time
+import base64
 import boto3
 import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 from botocore.config import Config
+from boto3.s3.transfer import TransferConfig
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Pre-signed URL cache settings
+PRESIGNED_URL_CACHE_MAX_SIZE = 10000
+# A cached URL is only handed out during the first 10% of its lifetime, so callers
+# always get at least 90% of the lifetime they asked for, and a URL signed with
+# since-rotated temporary credentials is not reused for long
+PRESIGNED_URL_REUSE_FRACTION = 0.1
+PRESIGNED_URL_CLIENT_METHOD = 'get_object'
+
+# Checksums use hashlib.sha256, which is backed by the runtime's OpenSSL build. OpenSSL
+# selects the CPU's SHA extensions (x86 SHA-NI, ARMv8 SHA2) at runtime when available.
+# Files up to this size are read from disk once and uploaded with a single PUT
+SINGLE_PASS_UPLOAD_MAX_BYTES = 8 * 1024 * 1024  # 8 MB
+# Large files are read and hashed in 1 MB blocks to keep syscall overhead low
+HASH_READ_BUFFER_BYTES = 1024 * 1024  # 1 MB
+# Content IDs are the leading 64 bits of the SHA-256 checksum
+CONTENT_ID_HEX_CHARS = 16
+
+# Transient S3 errors (500 InternalError, 503 SlowDown) are retried with jittered exponential
+# backoff; adaptive mode also rate-limits the client while S3 is throttling
+S3_RETRY_MAX_ATTEMPTS = 10
+
+# Lazy initialization of a shared S3 client so warm invocations reuse its connection pool
+_s3_client = None
+
+def get_s3_client():
+    """Get or create the shared S3 client (lazy initialization)."""
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client('s3', config=Config(
+            # signature_version='s3v4' is required for secure pre-signed URLs
+            signature_version='s3v4',
+            region_name=os.environ.get('AWS_REGION', 'ap-south-1'),
+            # Enough pooled connections for every multipart upload thread, with headroom
+            max_pool_connections=S3DocumentManager.TRANSFER_CONFIG.max_concurrency * 2,
+            retries={'mode': 'adaptive', 'max_attempts': S3_RETRY_MAX_ATTEMPTS},
+            tcp_keepalive=True
+        ))
+    return _s3_client
+
 class S3DocumentManager:
-    def __init__(self, s3_client=None):
-        # We enforce signature_version='s3v4' which is required for secure pre-signed URLs
-        self.s3 = s3_client or boto3.client('s3', config=Config(signature_version='s3v4', region_name=os.environ.get('AWS_REGION', 'ap-south-1')))
-        self.bucket_name = os.environ.get('S3_DOCUMENT_BUCKET', 'auditflow-documents-prod')
+    # Large PDFs are split into 16 MB parts and uploaded over parallel connections
+    TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=SINGLE_PASS_UPLOAD_MAX_BYTES,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=10,
+        use_threads=True
+    )
 
-    def upload_document(self, file_path: str, object_key: str) -> str:
+    def __init__(self, s3_client=None, bucket_name: str = None):
+        self.s3 = s3_client or get_s3_client()
+        # Resolved once here; every operation reads self.bucket_name
+        self.bucket_name = bucket_name or os.environ.get('S3_DOCUMENT_BUCKET', 'auditflow-documents-prod')
+        # (bucket, key, method, expiration) -> (url, absolute expiry epoch)
+        self._presigned_url_cache = {}
+        self._presigned_url_lock = threading.Lock()
+
+    def upload_document(self, file_path: str, object_key: str, return_metadata: bool = False):
         """
         Uploads a document to S3, calculating a SHA-256 checksum for integrity.
         Returns the calculated checksum.
+        If return_metadata is True, returns (checksum, metadata) where metadata describes
+        the stored object, so callers do not need a follow-up head_object call. Its
+        content_id is a short key for deduplicating documents within the pipeline.
         """
-        # Calculate checksum
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        file_hash = sha256_hash.hexdigest()
+        file_size = os.path.getsize(file_path)
 
         try:
-            self.s3.upload_file(
-                file_path, 
-                self.bucket_name, 
-                object_key,
-                ExtraArgs={
-                    'Metadata': {'checksum': file_hash},
-                    'ServerSideEncryption': 'aws:kms' # Enforces KMS encryption at rest
-                }
-            )
+            if file_size <= SINGLE_PASS_UPLOAD_MAX_BYTES:
+                # Read the file once: the same buffer is hashed and sent as a single PUT
+                with open(file_path, "rb") as f:
+                    body = f.read()
+                digest = hashlib.sha256(body).digest()
+                file_hash = digest.hex()
+                self.s3.put_object(
+                    Bucket=self.bucket_name,
+                    Key=object_key,
+                    Body=body,
+                    Metadata={'checksum': file_hash},
+                    # S3 verifies the body against our digest and rejects a mismatch,
+                    # so integrity is confirmed without downloading the object again
+                    ChecksumAlgorithm='SHA256',
+                    ChecksumSHA256=base64.b64encode(digest).decode('ascii'),
+                    ServerSideEncryption='aws:kms' # Enforces KMS encryption at rest
+                )
+            else:
+                # Large files are hashed in a streaming pass, then uploaded by the transfer manager
+                sha256_hash = hashlib.sha256()
+                with open(file_path, "rb", buffering=HASH_READ_BUFFER_BYTES) as f:
+                    for byte_block in iter(lambda: f.read(HASH_READ_BUFFER_BYTES), b""):
+                        sha256_hash.update(byte_block)
+                file_hash = sha256_hash.hexdigest()
+                self.s3.upload_file(
+                    file_path, 
+                    self.bucket_name, 
+                    object_key,
+                    ExtraArgs={
+                        'Metadata': {'checksum': file_hash},
+                        # Each part is verified by S3 as it is received
+                        'ChecksumAlgorithm': 'SHA256',
+                        'ServerSideEncryption': 'aws:kms' # Enforces KMS encryption at rest
+                    },
+                    Config=self.TRANSFER_CONFIG
+                )
             logger.info(f"Successfully uploaded {object_key} to {self.bucket_name} with checksum {file_hash}")
+            if return_metadata:
+                metadata = {
+                    'bucket': self.bucket_name,
+                    'key': object_key,
+                    'content_length': file_size,
+                    'checksum': file_hash,
+                    # Short in-memory dedup/cache key derived from the checksum, no second hash pass
+                    'content_id': file_hash[:CONTENT_ID_HEX_CHARS],
+                    'server_side_encryption': 'aws:kms'
+                }
+                return file_hash, metadata
             return file_hash
         except ClientError as e:
             logger.error(f"Failed to upload {object_key}: {e.response['Error']['Message']}")
             raise
 
+    def upload_documents(self, items, return_metadata: bool = False) -> list:
+        """
+        Uploads several documents in parallel, e.g. every document for a loan application.
+        items is a sequence of (file_path, object_key) pairs; results are returned in the
+        same order, each as upload_document would return it. The first failure is re-raised.
+        Workers are capped at the transfer concurrency so they fit the shared connection pool.
+        """
+        items = list(items)
+        if not items:
+            return []
+        max_workers = min(self.TRANSFER_CONFIG.max_concurrency, len(items))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda item: self.upload_document(item[0], item[1], return_metadata=return_metadata),
+                items
+            ))
+
     def generate_presigned_download_url(self, object_key: str, expiration_seconds: int = 3600) -> str:
         """
         Generates a secure, temporary URL for the frontend Document Viewer.
+        Repeated requests for the same document shortly after signing reuse the cached
+        URL, skipping the SigV4 signing work.
         """
+        cache_key = (self.bucket_name, object_key, PRESIGNED_URL_CLIENT_METHOD, expiration_seconds)
+        now = time.time()
+        with self._presigned_url_lock:
+            cached = self._presigned_url_cache.get(cache_key)
+            if cached and now < cached[1] + expiration_seconds * PRESIGNED_URL_REUSE_FRACTION:
+                logger.info(f"Reusing cached pre-signed URL for {object_key}")
+                return cached[0]
+
         try:
             url = self.s3.generate_presigned_url(
-                ClientMethod='get_object',
-                Params={
-                    'Bucket': self.bucket_name,
-                    'Key': object_key
-                },
-                ExpiresIn=expiration_seconds
+                ClientMethod=PRESIGNED_URL_CLIENT_METHOD,
+                Params={'Bucket': self.bucket_name, 'Key': object_key},
+                ExpiresIn=expiration_seconds,
+                HttpMethod='GET'
             )
             logger.info(f"Generated pre-signed URL for {object_key}")
+            with self._presigned_url_lock:
+                if len(self._presigned_url_cache) >= PRESIGNED_URL_CACHE_MAX_SIZE:
+                    self._evict_expired_presigned_urls(now)
+                # Entries hold the URL and when it was signed
+                self._presigned_url_cache[cache_key] = (url, now)
             return url
         except ClientError as e:
             logger.error(f"Failed to generate pre-signed URL for {object_key}: {e.response['Error']['Message']}")
             raise
 
+    def _evict_expired_presigned_urls(self, now: float) -> None:
+        """Drops entries past their reuse window, clearing the cache entirely if it is still full."""
+        # The last element of each cache key is the URL's lifetime in seconds
+        expired = [k for k, (_, cached_at) in self._presigned_url_cache.items()
+                   if now >= cached_at + k[-1] * PRESIGNED_URL_REUSE_FRACTION]
+        for k in expired:
+            del self._presigned_url_cache[k]
+        if len(self._presigned_url_cache) >= PRESIGNED_URL_CACHE_MAX_SIZE:
+            self._presigned_url_cache.clear()
+
     def get_document_metadata(self, object_key: str) -> dict:
         """
         Retrieves metadata for a document from S3.
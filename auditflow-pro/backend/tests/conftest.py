@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Shared pytest configuration for the backend test suite.
+
+The suite is safe to run in parallel with pytest-xdist:
+
+    pytest -n auto --dist=loadfile
+
+``--dist=loadfile`` keeps every test of a module on the same worker so the
+per-module moto fixtures are never split across processes.
+"""
+
+import os
+import sys
+from dataclasses import asdict, replace
+
+import boto3
+import pytest
+from moto import mock_aws
+
+AWS_REGION = 'ap-south-1'
+
+# Tests import the backend packages (functions.*, shared.*) from the backend
+# directory, and the validator tests import the Lambda's modules (app, rules) and
+# the shared models as top-level modules, mirroring the deployment zip layout.
+# The paths are added once per process (once per xdist worker) rather than per module.
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (_BACKEND_DIR,
+              os.path.join(_BACKEND_DIR, 'functions', 'validator'),
+              os.path.join(_BACKEND_DIR, 'shared')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from models import DocumentMetadata  # noqa: E402  (needs the path setup above)
+
+# Bookkeeping fields every test document shares; tests override what they assert on
+_BASE_DOC = DocumentMetadata(
+    document_id='doc-0',
+    loan_application_id='loan-123',
+    s3_bucket='test-bucket',
+    s3_key='test/doc0.pdf',
+    upload_timestamp='2024-01-15T10:00:00Z',
+    file_name='doc-0.pdf',
+    file_size_bytes=1024,
+    file_format='PDF',
+    checksum='abc123',
+    classification_confidence=0.95,
+    processing_status='COMPLETED',
+)
+
+
+def pytest_configure(config):
+    """Sets the test environment once, before any module or fixture reads it."""
+    # Every xdist worker is its own process with its own in-process mock_aws backend,
+    # so table names need no per-worker suffix. Explicit settings from the developer's
+    # environment are kept.
+    os.environ.setdefault('AWS_DEFAULT_REGION', AWS_REGION)
+    os.environ.setdefault('DOCUMENTS_TABLE', 'AuditFlow-Documents-Test')
+    os.environ.setdefault('AUDIT_RECORDS_TABLE', 'AuditFlow-AuditRecords-Test')
+
+
+@pytest.fixture(scope="session")
+def _moto_aws():
+    """
+    Starts a single moto backend shared by every test module in the session.
+
+    moto 5 removed the per-service decorators (mock_s3, mock_dynamodb); mock_aws
+    only patches the HTTP layer at entry and builds each service backend lazily on
+    its first request, so S3-only modules never load the DynamoDB models.
+    """
+    with mock_aws() as mock:
+        yield mock
+
+
+@pytest.fixture(scope="session")
+def aws_session(_moto_aws):
+    """One boto3 session so service models are loaded once per session."""
+    return boto3.Session(region_name=AWS_REGION)
+
+
+@pytest.fixture(scope="session")
+def dynamodb_resource(aws_session):
+    """Session-wide DynamoDB resource bound to the shared moto backend."""
+    return aws_session.resource('dynamodb')
+
+
+@pytest.fixture(scope="session")
+def s3_client(aws_session):
+    """Session-wide S3 client bound to the shared moto backend."""
+    return aws_session.client('s3')
+
+
+@pytest.fixture
+def moto_reset(_moto_aws):
+    """Wipes all mocked resources after the test so state never leaks between tests."""
+    yield
+    _moto_aws.reset()
+
+
+@pytest.fixture(scope="session")
+def doc_factory():
+    """Returns a builder for completed test documents, e.g. doc_factory(document_id='doc-1', ...)."""
+    def make(document_id, **overrides):
+        fields = {
+            's3_key': f"test/{document_id.replace('-', '')}.pdf",
+            'file_name': f"{document_id}.pdf",
+            # Fresh containers so documents never share mutable state through the base
+            'extracted_data': {},
+            'low_confidence_fields': [],
+            'pii_detected': [],
+            **overrides,
+        }
+        return replace(_BASE_DOC, document_id=document_id, **fields)
+    return make
+
+
+@pytest.fixture(scope="session")
+def handler_event():
+    """Returns a builder for validator events carrying documents as Step Functions passes them."""
+    def make(*documents, loan_application_id='loan-123'):
+        return {
+            'loan_application_id': loan_application_id,
+            'documents': [asdict(doc) for doc in documents],
+        }
+    return make
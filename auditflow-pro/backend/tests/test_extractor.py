@@ -3,11 +3,6 @@ import pytest
 import json
 from unittest.mock import Mock, patch, MagicMock
 from botocore.exceptions import ClientError
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from functions.extractor.app import (
     lambda_handler,
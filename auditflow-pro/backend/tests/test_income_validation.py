@@ -3,17 +3,10 @@
 Unit tests for Task 8.4: Income validation logic.
 """
 
-import os
-import sys
 import pytest
-from unittest.mock import Mock, patch
-
-# Add function path to sys.path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../functions/validator'))
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../shared'))
 
+# app, models and rules are importable through the path setup in conftest.py
 from app import lambda_handler
-from models import DocumentMetadata
 from rules import validate_income
 
 
@@ -94,6 +87,17 @@ class TestIncomeValidation:
         assert 'doc-2' in inconsistencies[0]['source_documents']
         assert 'doc-3' in inconsistencies[0]['source_documents']
     
+    def test_validate_income_parses_formatted_amounts(self):
+        """Test validate_income with currency-formatted strings alongside plain numbers."""
+        w2_wages = [
+            {'value': '$50,000.00', 'source': 'doc-1'},
+            {'value': 25000, 'source': 'doc-2'}
+        ]
+        tax_agi = {'value': '75,000', 'source': 'doc-3'}
+        
+        inconsistencies = validate_income(w2_wages, tax_agi)
+        assert len(inconsistencies) == 0
+    
     def test_validate_income_empty_w2_wages(self):
         """Test validate_income with no W2 wages."""
         w2_wages = []
@@ -112,221 +116,127 @@ class TestIncomeValidation:
         inconsistencies = validate_income(w2_wages, tax_agi)
         assert len(inconsistencies) == 0
     
-    def test_handler_with_income_validation(self):
+    def test_handler_with_income_validation(self, doc_factory, handler_event):
         """Test Lambda handler performs income validation."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
         context = {}
         
         # Create mock documents with W2 and tax form
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            classification_confidence=0.95,
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98},
                 'wages': {'value': 75000.00, 'confidence': 0.99}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='TAX_FORM',
-            classification_confidence=0.92,
-            processing_status='COMPLETED',
             extracted_data={
                 'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97},
                 'adjusted_gross_income': {'value': 90000.00, 'confidence': 0.98}  # 20% discrepancy
             }
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
-            assert len(response['inconsistencies']) == 1
-            assert response['inconsistencies_found'] == 1
-            
-            # Verify inconsistency details
-            inc = response['inconsistencies'][0]
-            assert inc['field'] == 'income'
-            assert inc['severity'] == 'HIGH'
-            assert 'doc-1' in inc['source_documents']
-            assert 'doc-2' in inc['source_documents']
-    
-    def test_handler_with_matching_income(self):
+        event = handler_event(mock_doc1, mock_doc2)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
+        assert len(response['inconsistencies']) == 1
+        assert response['inconsistencies_found'] == 1
+        
+        # Verify inconsistency details
+        inc = response['inconsistencies'][0]
+        assert inc['field'] == 'income'
+        assert inc['severity'] == 'HIGH'
+        assert 'doc-1' in inc['source_documents']
+        assert 'doc-2' in inc['source_documents']
+
+    def test_handler_with_matching_income(self, doc_factory, handler_event):
         """Test Lambda handler with matching income returns no inconsistencies."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
         context = {}
         
         # Create mock documents with matching income
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            classification_confidence=0.95,
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98},
                 'wages': {'value': 75000.00, 'confidence': 0.99}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='TAX_FORM',
-            classification_confidence=0.92,
-            processing_status='COMPLETED',
             extracted_data={
                 'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97},
                 'adjusted_gross_income': {'value': 75000.00, 'confidence': 0.98}
             }
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
-            assert len(response['inconsistencies']) == 0
-            assert response['inconsistencies_found'] == 0
-    
-    def test_handler_with_multiple_w2s(self):
+        event = handler_event(mock_doc1, mock_doc2)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
+        assert len(response['inconsistencies']) == 0
+        assert response['inconsistencies_found'] == 0
+
+    def test_handler_with_multiple_w2s(self, doc_factory, handler_event):
         """Test Lambda handler sums multiple W2 wages."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2', 'doc-3']
-        }
         context = {}
         
         # Create mock documents with two W2s and one tax form
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2_job1.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            classification_confidence=0.95,
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98},
                 'wages': {'value': 50000.00, 'confidence': 0.99}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:01:00Z',
-            file_name='w2_job2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='def456',
             document_type='W2',
-            classification_confidence=0.96,
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98},
                 'wages': {'value': 25000.00, 'confidence': 0.99}
             }
         )
         
-        mock_doc3 = DocumentMetadata(
+        mock_doc3 = doc_factory(
             document_id='doc-3',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc3.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='ghi789',
             document_type='TAX_FORM',
-            classification_confidence=0.92,
-            processing_status='COMPLETED',
             extracted_data={
                 'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97},
                 'adjusted_gross_income': {'value': 75000.00, 'confidence': 0.98}
             }
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2, mock_doc3]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
-            # Should sum 50000 + 25000 = 75000, which matches AGI of 75000
-            assert len(response['inconsistencies']) == 0
-            assert response['inconsistencies_found'] == 0
+        event = handler_event(mock_doc1, mock_doc2, mock_doc3)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
+        # Should sum 50000 + 25000 = 75000, which matches AGI of 75000
+        assert len(response['inconsistencies']) == 0
+        assert response['inconsistencies_found'] == 0
 
 
 if __name__ == '__main__':
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
+import sys
 import pytest
-from hypothesis import given, strategies as st
+from hypothesis import given, settings, strategies as st
 from shared.models import (
     ExtractedField, DocumentMetadata, W2Data, BankStatementData,
     TaxFormData, DriversLicenseData, IDDocumentData, GoldenRecord,
-    GoldenRecordField, Inconsistency, RiskFactor, Alert, AuditRecord
+    GoldenRecordField, Inconsistency, RiskFactor, Alert, AuditRecord, Severity,
+    _coerce_severity
 )
 
 # Strategy to generate random ExtractedField objects
@@ -31,6 +33,7 @@ document_metadata_strategy = st.builds(
 )
 
 @given(document_metadata_strategy)
+@settings(deadline=None)
 def test_round_trip_serialization_preserves_data(doc_metadata):
     """
     Property 1: For all valid document data objects, serializing to JSON 
@@ -179,10 +182,62 @@ def test_inconsistency_serialization():
     
     assert inc_restored.inconsistency_id == "inc-1"
     assert inc_restored.field == "name"
-    assert inc_restored.severity == "CRITICAL"
+    assert inc_restored.severity is Severity.CRITICAL
+    assert inc.to_dict()['severity'] == "CRITICAL"
     assert inc_restored.expected_value == "John Doe"
 
 
+def test_extracted_field_from_arrays():
+    """Test building fields from columnar values and confidences."""
+    fields = ExtractedField.from_arrays(["John Doe", "123 Main St", None], [0.95, 0.75, None])
+    
+    assert [f.value for f in fields] == ["John Doe", "123 Main St", None]
+    assert [f.requires_manual_review for f in fields] == [False, True, False]
+    with pytest.raises(ValueError):
+        ExtractedField.from_arrays(["John Doe"], [])
+
+
+def test_confidences_are_quantized():
+    """Confidences keep three decimal places; None passes through."""
+    assert ExtractedField(value="x", confidence=0.981234567).confidence == 0.981
+    assert ExtractedField(value="x", confidence=None).confidence is None
+    # The review threshold sees the raw confidence, not the rounded one
+    low = ExtractedField(value="x", confidence=0.7996)
+    assert low.requires_manual_review is True
+    assert low.confidence == 0.8
+
+    doc = DocumentMetadata(
+        document_id="doc-1", loan_application_id="loan-1", s3_bucket="b",
+        s3_key="k", upload_timestamp="2024-01-01T00:00:00", file_name="f.pdf",
+        file_size_bytes=1, file_format="PDF", checksum="abc",
+        classification_confidence=0.9549999
+    )
+    assert doc.classification_confidence == 0.955
+
+
+def test_inconsistency_severity_coercion_is_memoized():
+    """Test that severity names of any case and numeric levels coerce via a shared cache."""
+    _coerce_severity.cache_clear()
+    severities = [
+        Inconsistency(
+            inconsistency_id=f"inc-{i}",
+            field="name",
+            severity=raw,
+            expected_value="John Doe",
+            actual_value="Jon Doe",
+            source_documents=["doc-1", "doc-2"],
+            description="Name spelling variation",
+            detected_by="cross_document_validator"
+        ).severity
+        for i, raw in enumerate(["HIGH", "high", 3, "HIGH", "HIGH"])
+    ]
+    
+    assert severities == [Severity.HIGH, Severity.HIGH, Severity.CRITICAL, Severity.HIGH, Severity.HIGH]
+    assert _coerce_severity.cache_info().hits == 2
+    with pytest.raises(KeyError):
+        _coerce_severity("SEVERE")
+
+
 def test_audit_record_serialization():
     """Test AuditRecord serialization and deserialization."""
     inc = Inconsistency(
@@ -234,3 +289,38 @@ def test_audit_record_serialization():
     assert len(audit_restored.inconsistencies) == 1
     assert len(audit_restored.risk_factors) == 1
     assert len(audit_restored.alerts_triggered) == 1
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses require Python 3.10+")
+def test_high_volume_models_are_slotted():
+    """Test that the per-document and per-field models carry no per-instance __dict__."""
+    field = ExtractedField(value="John Doe", confidence=0.95)
+    inc = Inconsistency(
+        inconsistency_id="inc-1",
+        field="name",
+        severity="HIGH",
+        expected_value="John Doe",
+        actual_value="Jon Doe",
+        source_documents=["doc-1", "doc-2"],
+        description="Name mismatch",
+        detected_by="cross_document_validator"
+    )
+    
+    doc = DocumentMetadata(
+        document_id="doc-1",
+        loan_application_id="loan-1",
+        s3_bucket="test-bucket",
+        s3_key="docs/w2.pdf",
+        upload_timestamp="2026-02-22T12:00:00Z",
+        file_name="w2.pdf",
+        file_size_bytes=1024,
+        file_format="PDF",
+        checksum="abc123"
+    )
+    
+    assert not hasattr(field, '__dict__')
+    assert not hasattr(inc, '__dict__')
+    assert not hasattr(doc, '__dict__')
+    assert DocumentMetadata.from_dict(doc.to_dict()) == doc
+    assert ExtractedField.from_dict(field.to_dict()) == field
+    assert Inconsistency.from_dict(inc.to_dict()) == inc
@@ -7,10 +7,7 @@ import boto3
 from moto import mock_aws
 from functions.reporter.app import lambda_handler, save_audit_record, trigger_alerts
 
-# Set environment variables for testing
-os.environ['AWS_DEFAULT_REGION'] = 'ap-south-1'
-os.environ['AUDIT_RECORDS_TABLE'] = 'AuditFlow-AuditRecords-Test'
-os.environ['DOCUMENTS_TABLE'] = 'AuditFlow-Documents-Test'
+# Table names are set per xdist worker in conftest.py
 
 @pytest.fixture
 def aws_credentials():
@@ -31,14 +28,14 @@ def mock_infrastructure(aws_credentials):
             TableName=os.environ['AUDIT_RECORDS_TABLE'],
             KeySchema=[{'AttributeName': 'audit_record_id', 'KeyType': 'HASH'}],
             AttributeDefinitions=[{'AttributeName': 'audit_record_id', 'AttributeType': 'S'}],
-            BillingMode='PAY_PER_REQUEST'
+            ProvisionedThroughput={'ReadCapacityUnits': 1, 'WriteCapacityUnits': 1}
         )
         
         doc_table = dynamodb.create_table(
             TableName=os.environ['DOCUMENTS_TABLE'],
             KeySchema=[{'AttributeName': 'document_id', 'KeyType': 'HASH'}],
             AttributeDefinitions=[{'AttributeName': 'document_id', 'AttributeType': 'S'}],
-            BillingMode='PAY_PER_REQUEST'
+            ProvisionedThroughput={'ReadCapacityUnits': 1, 'WriteCapacityUnits': 1}
         )
         
         # Populate a mock document so we can test the status update
@@ -4,6 +4,7 @@
 import pytest
 from hypothesis import given, strategies as st
 from functions.risk_scorer.scorer import (
+    _inconsistency_points,
     calculate_inconsistency_score,
     calculate_total_risk,
     determine_risk_level
@@ -56,6 +57,33 @@ def test_score_capping_at_100():
     assert result["risk_score"] == 100
     assert result["risk_level"] == "CRITICAL"
 
+def test_inconsistency_score_bulk():
+    """Test that scoring stays linear and correct for very large audits."""
+    inconsistencies = [
+        {"field": "name", "severity": "HIGH", "description": "Name mismatch"},
+        {"field": "address", "severity": "HIGH", "description": "Address mismatch"},
+        {"field": "income", "severity": "MEDIUM", "description": "Income mismatch"},
+        {"field": "ssn", "severity": "CRITICAL", "description": "SSN mismatch"},
+        {"field": "employer", "severity": "LOW", "description": "Not scored"}
+    ] * 2_000
+    
+    score, factors = calculate_inconsistency_score(inconsistencies)
+    
+    assert score == (15 + 20 + 15 + 30) * 2_000
+    assert len(factors) == 8_000
+
+def test_calculate_total_risk_scores_repeated_fields_from_cache():
+    """Test that 1000 inconsistencies on one (field, severity) pair are scored with a single lookup."""
+    bulk_inc = [{"field": "name", "severity": "HIGH"}] * 1000
+    _inconsistency_points.cache_clear()
+    
+    result = calculate_total_risk(bulk_inc, {}, [])
+    
+    assert result["raw_score"] == 15000
+    assert result["risk_score"] == 100
+    cache = _inconsistency_points.cache_info()
+    assert (cache.misses, cache.hits) == (1, 999)
+
 # --- Task 9.6: Property-Based Testing ---
 
 # Generate random inconsistencies
@@ -1,21 +1,43 @@
 # -*- coding: utf-8 -*-
 import os
+import time
+import base64
+import hashlib
 import pytest
-import boto3
-from moto import mock_aws
+from botocore.awsrequest import AWSResponse
 from botocore.exceptions import ClientError
+from shared import storage
 from shared.storage import S3DocumentManager
 
-# Setup environment variables for the test
-os.environ['AWS_DEFAULT_REGION'] = 'ap-south-1'
-os.environ['S3_DOCUMENT_BUCKET'] = 'auditflow-test-bucket'
+@pytest.fixture(scope="session", autouse=True)
+def _storage_env():
+    """Points S3DocumentManager at the test bucket without mutating os.environ at import."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('S3_DOCUMENT_BUCKET', 'auditflow-test-bucket')
+        yield
 
-@pytest.fixture
-def s3_mock():
-    with mock_aws():
-        s3 = boto3.client('s3', region_name='ap-south-1')
-        s3.create_bucket(Bucket=os.environ['S3_DOCUMENT_BUCKET'])
-        yield s3
+def _purge_bucket(s3, bucket):
+    """Deletes every object in the bucket, 1000 keys per delete_objects call."""
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, PaginationConfig={'PageSize': 1000}):
+        keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+        if keys:
+            s3.delete_objects(Bucket=bucket, Delete={'Objects': keys, 'Quiet': True})
+
+@pytest.fixture(scope="module")
+def s3_mock(s3_client):
+    """Creates the test bucket once per module on the shared moto backend from conftest.py."""
+    bucket = os.environ['S3_DOCUMENT_BUCKET']
+    s3_client.create_bucket(Bucket=bucket)
+    yield s3_client
+    _purge_bucket(s3_client, bucket)
+    s3_client.delete_bucket(Bucket=bucket)
+
+@pytest.fixture(autouse=True)
+def _clean_bucket(s3_mock):
+    """Empties the test bucket after each test so tests stay isolated."""
+    yield
+    _purge_bucket(s3_mock, os.environ['S3_DOCUMENT_BUCKET'])
 
 @pytest.fixture
 def storage_manager(s3_mock):
@@ -28,21 +50,86 @@ def dummy_file(tmp_path):
     file_path.write_text("Dummy PDF content for testing checksums.")
     return str(file_path)
 
-def test_upload_document_with_checksum(storage_manager, dummy_file, s3_mock):
+def test_get_s3_client_is_shared(monkeypatch):
+    """Test that managers created without a client share one pooled S3 client."""
+    monkeypatch.setattr(storage, '_s3_client', None)
+    
+    client = storage.get_s3_client()
+    
+    assert storage.get_s3_client() is client
+    assert S3DocumentManager().s3 is client
+    assert client.meta.config.max_pool_connections == S3DocumentManager.TRANSFER_CONFIG.max_concurrency * 2
+    assert client.meta.config.retries['mode'] == 'adaptive'
+
+def test_bucket_name_resolved_at_construction(s3_mock, monkeypatch):
+    """Test that an explicit bucket name wins and the environment is read only once."""
+    assert S3DocumentManager(s3_client=s3_mock, bucket_name="explicit-bucket").bucket_name == "explicit-bucket"
+    
+    manager = S3DocumentManager(s3_client=s3_mock)
+    monkeypatch.setenv('S3_DOCUMENT_BUCKET', 'changed-bucket')
+    assert manager.bucket_name == 'auditflow-test-bucket'
+
+def test_upload_document_with_checksum(storage_manager, dummy_file):
     """Test that file uploads successfully and generates a valid checksum."""
     object_key = "loans/123/w2.pdf"
     
-    # Perform upload
-    checksum = storage_manager.upload_document(dummy_file, object_key)
+    # Perform upload, asking for the stored object's metadata in the same call
+    checksum, metadata = storage_manager.upload_document(dummy_file, object_key, return_metadata=True)
     
     # Assert checksum is returned and is a valid sha256 length (64 chars)
     assert checksum is not None
     assert len(checksum) == 64
     
-    # Verify the file actually exists in the mocked S3 bucket
-    response = s3_mock.head_object(Bucket=os.environ['S3_DOCUMENT_BUCKET'], Key=object_key)
-    assert response['ResponseMetadata']['HTTPStatusCode'] == 200
-    assert response['Metadata']['checksum'] == checksum
+    # Verify the returned metadata describes the uploaded object
+    assert metadata['bucket'] == os.environ['S3_DOCUMENT_BUCKET']
+    assert metadata['key'] == object_key
+    assert metadata['checksum'] == checksum
+    assert metadata['content_length'] == os.path.getsize(dummy_file)
+    assert metadata['server_side_encryption'] == 'aws:kms'
+    assert metadata['content_id'] == checksum[:16]
+
+def test_upload_document_sends_sha256_for_server_verification(storage_manager, dummy_file):
+    """Test that S3 stores the SHA-256 it verified, so no re-download is needed to confirm it."""
+    object_key = "loans/123/w2.pdf"
+    checksum = storage_manager.upload_document(dummy_file, object_key)
+    
+    response = storage_manager.s3.head_object(
+        Bucket=storage_manager.bucket_name, Key=object_key, ChecksumMode='ENABLED'
+    )
+    assert response['ChecksumSHA256'] == base64.b64encode(bytes.fromhex(checksum)).decode('ascii')
+
+def test_upload_large_document_streams_checksum(storage_manager, tmp_path, monkeypatch):
+    """Test that files above the single-pass limit go through the transfer manager."""
+    monkeypatch.setattr(storage, 'SINGLE_PASS_UPLOAD_MAX_BYTES', 16)
+    # Hash across several read blocks, including a short final one
+    monkeypatch.setattr(storage, 'HASH_READ_BUFFER_BYTES', 100)
+    large_file = tmp_path / "large_doc.pdf"
+    content = b"x" * 1024
+    large_file.write_bytes(content)
+    
+    checksum = storage_manager.upload_document(str(large_file), "loans/123/large.pdf")
+    
+    assert checksum == hashlib.sha256(content).hexdigest()
+    metadata = storage_manager.get_document_metadata("loans/123/large.pdf")
+    assert metadata['checksum'] == checksum
+    assert metadata['content_length'] == len(content)
+
+def test_upload_documents_in_parallel(storage_manager, tmp_path):
+    """Test that a batch of documents is uploaded concurrently with per-file checksums."""
+    items = []
+    for i in range(12):
+        file_path = tmp_path / f"doc_{i}.pdf"
+        file_path.write_bytes(f"Loan document {i}".encode())
+        items.append((str(file_path), f"loans/123/doc_{i}.pdf"))
+    
+    checksums = storage_manager.upload_documents(items)
+    
+    assert checksums == [
+        hashlib.sha256(f"Loan document {i}".encode()).hexdigest() for i in range(12)
+    ]
+    for (_, object_key), checksum in zip(items, checksums):
+        assert storage_manager.get_document_metadata(object_key)['checksum'] == checksum
+    assert storage_manager.upload_documents([]) == []
 
 def test_generate_presigned_url(storage_manager, dummy_file):
     """Test generating a secure download URL."""
@@ -59,6 +146,75 @@ def test_generate_presigned_url(storage_manager, dummy_file):
     # Check for signature parameters (moto uses older signature format)
     assert "Signature" in url or "X-Amz-Signature" in url
 
+def test_presigned_url_uses_sigv4(storage_manager, dummy_file):
+    """Test that download URLs are signed with SigV4 and carry the requested expiry."""
+    object_key = "loans/123/w2.pdf"
+    storage_manager.upload_document(dummy_file, object_key)
+    
+    url = storage_manager.generate_presigned_download_url(object_key, expiration_seconds=900)
+    
+    assert "X-Amz-Algorithm=AWS4-HMAC-SHA256" in url
+    assert "X-Amz-Signature=" in url
+    assert "X-Amz-Expires=900" in url
+
+def test_presigned_url_is_reused_only_early_in_its_lifetime(storage_manager, dummy_file, monkeypatch):
+    """Test that a cached URL is reused only while most of the requested lifetime remains."""
+    object_key = "loans/123/w2.pdf"
+    storage_manager.upload_document(dummy_file, object_key)
+    
+    calls = []
+    original_generate = storage_manager.s3.generate_presigned_url
+    def counting_generate(*args, **kwargs):
+        calls.append(kwargs)
+        return original_generate(*args, **kwargs)
+    monkeypatch.setattr(storage_manager.s3, 'generate_presigned_url', counting_generate)
+    
+    signed_at = time.time()
+    monkeypatch.setattr(storage.time, 'time', lambda: signed_at)
+    first = storage_manager.generate_presigned_download_url(object_key, expiration_seconds=600)
+    
+    # 59 s into a 600 s URL is still inside the 10% reuse window
+    monkeypatch.setattr(storage.time, 'time', lambda: signed_at + 59)
+    assert storage_manager.generate_presigned_download_url(object_key, expiration_seconds=600) == first
+    assert len(calls) == 1
+    
+    # Past the window a fresh URL is signed, so the caller still gets >= 90% of 600 s
+    monkeypatch.setattr(storage.time, 'time', lambda: signed_at + 61)
+    storage_manager.generate_presigned_download_url(object_key, expiration_seconds=600)
+    assert len(calls) == 2
+    assert all(cached_at == signed_at + 61 for _, cached_at in storage_manager._presigned_url_cache.values())
+
+class _ErrorBody:
+    """Minimal raw HTTP body for a canned S3 error response."""
+    def __init__(self, content):
+        self._content = content
+
+    def stream(self, **kwargs):
+        yield self._content
+
+def test_upload_retries_transient_errors(s3_mock, dummy_file, monkeypatch):
+    """Test that a transient 500 from S3 is retried and the upload still succeeds."""
+    monkeypatch.setattr(storage, '_s3_client', None)
+    client = storage.get_s3_client()
+    attempts = []
+    
+    def fail_first_attempt(request, **kwargs):
+        attempts.append(request.url)
+        if len(attempts) == 1:
+            body = b"<Error><Code>InternalError</Code><Message>We encountered an internal error.</Message></Error>"
+            return AWSResponse(request.url, 500, {}, _ErrorBody(body))
+        return None  # Fall through to moto
+    
+    client.meta.events.register('before-send.s3.PutObject', fail_first_attempt)
+    try:
+        manager = S3DocumentManager(s3_client=client)
+        checksum = manager.upload_document(dummy_file, "loans/123/w2.pdf")
+    finally:
+        client.meta.events.unregister('before-send.s3.PutObject', fail_first_attempt)
+    
+    assert len(attempts) == 2
+    assert manager.get_document_metadata("loans/123/w2.pdf")['checksum'] == checksum
+
 def test_upload_error_handling(storage_manager, dummy_file):
     """Test error handling for a non-existent bucket."""
     # Force an error by pointing to a bucket that hasn't been created in the mock
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 import pytest
-from shared.models import ExtractedField, Inconsistency
+from shared.models import ExtractedField, Inconsistency, Severity
 
 def test_extracted_field_confidence_bounds():
     """Test that confidence scores operate correctly."""
@@ -8,11 +8,8 @@ def test_extracted_field_confidence_bounds():
     field1 = ExtractedField(value="John Doe", confidence=0.95)
     assert field1.requires_manual_review is False
     
-    # Manual review flag logic (simulating the logic that will be in the extractor)
+    # Low confidence is flagged for manual review at construction
     field2 = ExtractedField(value="123 Main St", confidence=0.75)
-    if field2.confidence is not None and field2.confidence < 0.80:
-        field2.requires_manual_review = True
-        
     assert field2.requires_manual_review is True
 
 def test_inconsistency_severity_levels():
@@ -28,5 +25,6 @@ def test_inconsistency_severity_levels():
         detected_by="cross_document_validator"
     )
     
-    assert inc.severity in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+    assert inc.severity >= Severity.LOW
+    assert inc.severity is Severity.CRITICAL
     assert len(inc.source_documents) >= 2
@@ -4,101 +4,72 @@ Unit tests for the Cross-Document Validator Lambda function.
 Tests Task 8.1: Lambda handler and validation orchestration.
 """
 
-import os
-import sys
 import json
+import re
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
 
-# Add function path to sys.path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../functions/validator'))
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../shared'))
-
-from app import lambda_handler
-from models import DocumentMetadata, ExtractedField
+# app, models and rules are importable through the path setup in conftest.py
+from app import lambda_handler, _load_rules
+from models import ExtractedField
 from rules import validate_names, levenshtein_distance
 
 
+# Expected fragments of handler error messages, compiled once for the error-path tests
+_ERR_PATTERNS = {
+    'missing_loan': re.compile(r'loan_application_id'),
+    'empty': re.compile(r'documents list cannot be empty'),
+    'no_valid_documents': re.compile(r'No valid documents'),
+}
+
+
 class TestValidatorLambdaHandler:
     """Test suite for Task 8.1: Lambda handler and validation orchestration."""
     
-    def test_handler_with_valid_input(self):
-        """Test handler accepts valid loan_application_id and document_ids."""
+    def test_handler_with_valid_input(self, doc_factory, handler_event):
+        """Test handler accepts valid loan_application_id and documents."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
         context = {}
         
         # Create mock documents
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            classification_confidence=0.95,
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98},
                 'wages': {'value': 75000.00, 'confidence': 0.99}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='TAX_FORM',
-            classification_confidence=0.92,
-            processing_status='COMPLETED',
             extracted_data={
                 'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97},
                 'adjusted_gross_income': {'value': 75000.00, 'confidence': 0.98}
             }
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert response['loan_application_id'] == 'loan-123'
-            assert len(response['documents']) == 2
-            assert response['inconsistencies'] == []
-            assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
-            assert response['documents_loaded'] == 2
-            assert response['inconsistencies_found'] == 0
-            
-            # Verify repository was called correctly
-            assert mock_repo.get_document.call_count == 2
-            mock_repo.get_document.assert_any_call('doc-1')
-            mock_repo.get_document.assert_any_call('doc-2')
+        event = handler_event(mock_doc1, mock_doc2)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert response['loan_application_id'] == 'loan-123'
+        assert len(response['documents']) == 2
+        assert response['inconsistencies'] == []
+        assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
+        assert response['documents_loaded'] == 2
+        assert response['inconsistencies_found'] == 0
     
     def test_handler_missing_loan_application_id(self):
         """Test handler returns error when loan_application_id is missing."""
         # Arrange
         event = {
-            'document_ids': ['doc-1', 'doc-2']
+            'documents': [{'document_id': 'doc-1'}, {'document_id': 'doc-2'}]
         }
         context = {}
         
@@ -108,10 +79,10 @@ class TestValidatorLambdaHandler:
         # Assert
         assert response['statusCode'] == 400
         assert response['error'] == 'ValidationError'
-        assert 'loan_application_id' in response['message']
+        assert _ERR_PATTERNS['missing_loan'].search(response['message'])
     
-    def test_handler_missing_document_ids(self):
-        """Test handler returns error when document_ids is missing."""
+    def test_handler_missing_documents(self):
+        """Test handler returns error when documents is missing."""
         # Arrange
         event = {
             'loan_application_id': 'loan-123'
@@ -124,14 +95,41 @@ class TestValidatorLambdaHandler:
         # Assert
         assert response['statusCode'] == 400
         assert response['error'] == 'ValidationError'
-        assert 'document_ids' in response['message']
+        assert _ERR_PATTERNS['empty'].search(response['message'])
+    
+    def test_handler_rejects_invalid_input_without_loading_rules(self):
+        """Test input validation errors return before the rules module is loaded."""
+        _load_rules.cache_clear()
+        
+        response = lambda_handler({'documents': [{'document_id': 'doc-1'}]}, {})
+        
+        assert response['statusCode'] == 400
+        assert _load_rules.cache_info().currsize == 0
+    
+    def test_handler_clears_rule_caches_after_invocation(self, doc_factory, handler_event):
+        """Test that memoized names and Bedrock answers do not outlive the invocation."""
+        rules = _load_rules()
+        with patch.object(rules, '_invoke_bedrock', return_value='YES'):
+            rules._bedrock_yes_no('Is 123 Main St the same as 123 Main Street?')
+        docs = [
+            doc_factory(document_id='doc-1', document_type='W2',
+                        extracted_data={'employee_name': {'value': 'John Doe', 'confidence': 0.98}}),
+            doc_factory(document_id='doc-2', document_type='TAX_FORM',
+                        extracted_data={'taxpayer_name': {'value': 'Jon Doe', 'confidence': 0.97}})
+        ]
+        
+        response = lambda_handler(handler_event(*docs), {})
+        
+        assert response['statusCode'] == 200
+        assert rules._bounded_distance_cached.cache_info().currsize == 0
+        assert rules._bedrock_yes_no.cache_info().currsize == 0
     
-    def test_handler_empty_document_ids(self):
-        """Test handler returns error when document_ids list is empty."""
+    def test_handler_empty_documents(self):
+        """Test handler returns error when the documents list is empty."""
         # Arrange
         event = {
             'loan_application_id': 'loan-123',
-            'document_ids': []
+            'documents': []
         }
         context = {}
         
@@ -141,288 +139,142 @@ class TestValidatorLambdaHandler:
         # Assert
         assert response['statusCode'] == 400
         assert response['error'] == 'ValidationError'
-        assert 'empty' in response['message'].lower()
+        assert _ERR_PATTERNS['empty'].search(response['message'])
     
-    def test_handler_document_not_found(self):
-        """Test handler handles documents not found in DynamoDB."""
+    def test_handler_no_usable_documents(self):
+        """Test handler rejects an event whose documents all lack a document_id."""
         # Arrange
         event = {
             'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
+            'documents': [{'document_type': 'W2', 'extracted_data': {}}]
         }
         context = {}
         
-        # Mock DocumentRepository returning None (document not found)
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.return_value = None
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 400
-            assert response['error'] == 'ValidationError'
-            assert 'No valid documents' in response['message']
-    
-    def test_handler_filters_wrong_loan_application(self):
-        """Test handler filters out documents from different loan applications."""
-        # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
-        context = {}
-        
-        # Create mock documents with different loan_application_id
-        mock_doc1 = DocumentMetadata(
-            document_id='doc-1',
-            loan_application_id='loan-456',  # Different loan application
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
-            document_type='W2',
-            processing_status='COMPLETED',
-            extracted_data={'employee_name': {'value': 'John Doe', 'confidence': 0.98}}
-        )
-        
-        mock_doc2 = DocumentMetadata(
-            document_id='doc-2',
-            loan_application_id='loan-123',  # Correct loan application
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
-            document_type='TAX_FORM',
-            processing_status='COMPLETED',
-            extracted_data={'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97}}
-        )
+        # Act
+        response = lambda_handler(event, context)
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert len(response['documents']) == 1  # Only doc-2 should be included
-            assert response['documents'][0]['document_id'] == 'doc-2'
+        # Assert
+        assert response['statusCode'] == 400
+        assert response['error'] == 'ValidationError'
+        assert _ERR_PATTERNS['no_valid_documents'].search(response['message'])
     
-    def test_handler_filters_incomplete_documents(self):
+    def test_handler_filters_incomplete_documents(self, doc_factory, handler_event):
         """Test handler filters out documents that haven't completed processing."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
         context = {}
         
         # Create mock documents with different processing statuses
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
             processing_status='PROCESSING',  # Not completed
-            extracted_data={}
+            extracted_data={'employee_name': {'value': 'John Doe', 'confidence': 0.98}}
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='TAX_FORM',
-            processing_status='COMPLETED',
             extracted_data={'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97}}
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert len(response['documents']) == 1  # Only doc-2 should be included
-            assert response['documents'][0]['document_id'] == 'doc-2'
+        event = handler_event(mock_doc1, mock_doc2)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert len(response['documents']) == 1  # Only doc-2 should be included
+        assert response['documents'][0]['document_id'] == 'doc-2'
     
-    def test_handler_filters_documents_without_extracted_data(self):
+    def test_handler_filters_documents_without_extracted_data(self, doc_factory, handler_event):
         """Test handler filters out documents with no extracted data."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
         context = {}
         
         # Create mock documents
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            processing_status='COMPLETED',
             extracted_data={}  # No extracted data
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='TAX_FORM',
-            processing_status='COMPLETED',
             extracted_data={'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97}}
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert len(response['documents']) == 1  # Only doc-2 should be included
-            assert response['documents'][0]['document_id'] == 'doc-2'
+        event = handler_event(mock_doc1, mock_doc2)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert len(response['documents']) == 1  # Only doc-2 should be included
+        assert response['documents'][0]['document_id'] == 'doc-2'
     
-    def test_handler_initializes_empty_inconsistencies_list(self):
+    def test_handler_initializes_empty_inconsistencies_list(self, doc_factory, handler_event):
         """Test handler initializes an empty inconsistencies list when no inconsistencies found."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1']
-        }
         context = {}
         
-        mock_doc = DocumentMetadata(
+        mock_doc = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            processing_status='COMPLETED',
             extracted_data={'employee_name': {'value': 'John Doe', 'confidence': 0.98}}
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.return_value = mock_doc
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert 'inconsistencies' in response
-            assert isinstance(response['inconsistencies'], list)
-            assert len(response['inconsistencies']) == 0
-            assert response['inconsistencies_found'] == 0
+        event = handler_event(mock_doc)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert 'inconsistencies' in response
+        assert isinstance(response['inconsistencies'], list)
+        assert len(response['inconsistencies']) == 0
+        assert response['inconsistencies_found'] == 0
     
-    def test_handler_returns_proper_response_structure(self):
+    def test_handler_returns_proper_response_structure(self, doc_factory, handler_event):
         """Test handler returns the proper response structure."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1']
-        }
         context = {}
         
-        mock_doc = DocumentMetadata(
+        mock_doc = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            classification_confidence=0.95,
-            processing_status='COMPLETED',
             extracted_data={'employee_name': {'value': 'John Doe', 'confidence': 0.98}}
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.return_value = mock_doc
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert 'statusCode' in response
-            assert 'loan_application_id' in response
-            assert 'documents' in response
-            assert 'inconsistencies' in response
-            assert 'validation_status' in response
-            assert 'documents_loaded' in response
-            assert 'message' in response
-            
-            # Verify document structure
-            assert len(response['documents']) == 1
-            doc = response['documents'][0]
-            assert 'document_id' in doc
-            assert 'document_type' in doc
-            assert 'file_name' in doc
-            assert 'classification_confidence' in doc
-            assert 'extracted_data' in doc
-            
-            # Verify response includes new fields
-            assert 'inconsistencies_found' in response
-            assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
+        event = handler_event(mock_doc)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert 'statusCode' in response
+        assert 'loan_application_id' in response
+        assert 'documents' in response
+        assert 'inconsistencies' in response
+        assert 'validation_status' in response
+        assert 'documents_loaded' in response
+        assert 'message' in response
+        
+        # Verify document structure
+        assert len(response['documents']) == 1
+        doc = response['documents'][0]
+        assert 'document_id' in doc
+        assert 'document_type' in doc
+        assert 'file_name' in doc
+        assert 'classification_confidence' in doc
+        assert 'extracted_data' in doc
+        
+        # Verify response includes new fields
+        assert 'inconsistencies_found' in response
+        assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
 
 
 if __name__ == '__main__':
@@ -448,6 +300,47 @@ class TestNameValidation:
         """Test Levenshtein distance with three character differences."""
         assert levenshtein_distance("John Doe", "Jon D") == 3
     
+    def test_levenshtein_distance_matches_pure_python_fallback(self):
+        """Test that the accelerated and pure-Python implementations agree."""
+        import rules
+        pairs = [("John Doe", "Jon D"), ("", "abc"), ("kitten", "sitting"),
+                 ("Jane Smith", "John Doe"), ("123 Main St", "123 Main Street"),
+                 ("John A Doe", "John B Doe"), ("aaa", "aaaa"), ("abcabc", "abc")]
+        for s1, s2 in pairs:
+            assert levenshtein_distance(s1, s2) == rules._levenshtein_distance_py(s1, s2)
+    
+    def test_levenshtein_distance_long_strings(self):
+        """Test the bit-parallel fallback on strings longer than a machine word."""
+        import rules
+        assert rules._levenshtein_distance_py("a" * 100, "a" * 99 + "b") == 1
+        assert rules._levenshtein_distance_py("ab" * 40, "ba" * 40) == 2
+        assert rules._levenshtein_distance_py("x" * 70, "") == 70
+    
+    def test_levenshtein_distance_bounded(self):
+        """Test that the bounded distance is exact within the threshold and capped beyond it."""
+        from rules import levenshtein_distance_bounded
+        assert levenshtein_distance_bounded("john doe", "john doe") == 0
+        assert levenshtein_distance_bounded("john doe", "jon do") == 2
+        assert levenshtein_distance_bounded("john doe", "jon d") == 3
+        assert levenshtein_distance_bounded("john doe", "jane smith") == 3
+        assert levenshtein_distance_bounded("john doe", "jon d", max_dist=5) == 3
+    
+    def test_levenshtein_distance_bounded_skips_identical_strings(self):
+        """Test that identical strings return 0 without reaching the distance computation."""
+        import rules
+        rules._bounded_distance_cached.cache_clear()
+        assert rules.levenshtein_distance_bounded("john doe", "john doe") == 0
+        assert rules._bounded_distance_cached.cache_info().misses == 0
+    
+    def test_levenshtein_distance_bounded_is_memoized_symmetrically(self):
+        """Test that (a, b) and (b, a) are served from the same cache entry."""
+        import rules
+        rules._bounded_distance_cached.cache_clear()
+        assert rules.levenshtein_distance_bounded("john doe", "jon doe") == 1
+        assert rules.levenshtein_distance_bounded("jon doe", "john doe") == 1
+        info = rules._bounded_distance_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+    
     def test_levenshtein_distance_case_insensitive(self):
         """Test that Levenshtein distance is case-insensitive in validate_names."""
         names = [
@@ -537,241 +430,274 @@ class TestNameValidation:
         # Should not flag (after normalization they're the same)
         assert len(inconsistencies) == 0
     
-    def test_handler_with_name_validation(self):
+    def test_validate_names_computes_distance_once_per_distinct_name(self):
+        """Test that each name is normalized once and repeated names share one edit-distance computation."""
+        import rules
+        names = [{'value': v, 'source': f'doc-{i}'} for i, v in enumerate(
+            ['John Doe', 'JOHN  DOE', 'john doe', 'Jane Smith', 'Jane Smith'])]
+        
+        with patch.object(rules, 'levenshtein_distance_bounded', wraps=rules.levenshtein_distance_bounded) as spy, \
+             patch.object(rules, '_normalize_name', wraps=rules._normalize_name) as normalize_spy:
+            inconsistencies = validate_names(names)
+        
+        assert spy.call_count == 1
+        assert normalize_spy.call_count == len(names)
+        # Every John/Jane document pair is still reported, in document order
+        assert len(inconsistencies) == 6
+        assert inconsistencies[0]['source_documents'] == ['doc-0', 'doc-3']
+        assert inconsistencies[-1]['source_documents'] == ['doc-2', 'doc-4']
+    
+    def test_validate_names_skips_bounded_check_when_lengths_differ(self):
+        """Test that a length gap above the threshold flags a mismatch without the bounded check,
+        while the report still carries the exact distance."""
+        import rules
+        names = [
+            {'value': 'John Doe', 'source': 'doc-1'},
+            {'value': 'Jonathan Doeberg', 'source': 'doc-2'}
+        ]
+        
+        with patch.object(rules, '_bounded_distance_cached', wraps=rules._bounded_distance_cached) as spy:
+            inconsistencies = validate_names(names)
+        
+        assert spy.call_count == 0
+        assert len(inconsistencies) == 1
+        assert inconsistencies[0]['description'] == \
+            f"Name mismatch detected (Edit distance: {levenshtein_distance('john doe', 'jonathan doeberg')})"
+    
+    def test_validate_names_normalizes_non_ascii_case(self):
+        """Test that case folding also covers accented capitals."""
+        names = [
+            {'value': 'ÉMILE ZOLA', 'source': 'doc-1'},
+            {'value': 'émile  zola', 'source': 'doc-2'}
+        ]
+        assert validate_names(names) == []
+    
+    def test_validate_names_ignores_accents(self):
+        """Test that accented and unaccented spellings of a name match."""
+        names = [
+            {'value': 'José Muñoz', 'source': 'doc-1'},
+            {'value': 'JOSE MUNOZ', 'source': 'doc-2'},
+            {'value': 'Jose\u0301 Mun\u0303oz', 'source': 'doc-3'}  # decomposed accents
+        ]
+        assert validate_names(names) == []
+    
+    def test_bedrock_client_is_created_once_on_first_use(self, monkeypatch):
+        """Test that the Bedrock client (and boto3) is only set up when first requested."""
+        import rules
+        monkeypatch.setattr(rules, '_bedrock_client', None)
+
+        with patch('boto3.client', return_value=Mock()) as client_factory:
+            client = rules.get_bedrock_client()
+            assert rules.get_bedrock_client() is client
+
+        client_factory.assert_called_once_with('bedrock-runtime', region_name='ap-south-1')
+
+    def test_semantic_component_match_memoizes_bedrock_answers(self):
+        """Test that a component pair is sent to Bedrock once, in either order."""
+        import io
+        import rules
+        rules._bedrock_yes_no.cache_clear()
+        bedrock = Mock()
+        bedrock.invoke_model.side_effect = lambda **kwargs: {
+            'body': io.BytesIO(json.dumps({'content': [{'text': 'YES'}]}).encode())
+        }
+        
+        with patch.object(rules, 'get_bedrock_client', return_value=bedrock):
+            assert rules.semantic_component_match('123 Main St', '123 Main Street', 'street')
+            assert rules.semantic_component_match('123 Main Street', '123 Main St', 'street')
+        
+        assert bedrock.invoke_model.call_count == 1
+        rules._bedrock_yes_no.cache_clear()
+    
+    def test_semantic_component_match_does_not_cache_failures(self):
+        """Test that a failed Bedrock call falls back without caching the fallback answer."""
+        import rules
+        rules._bedrock_yes_no.cache_clear()
+        bedrock = Mock()
+        bedrock.invoke_model.side_effect = Exception("throttled")
+        
+        with patch.object(rules, 'get_bedrock_client', return_value=bedrock):
+            assert not rules.semantic_component_match('Springfield', 'Springfeld', 'city')
+        
+        assert rules._bedrock_yes_no.cache_info().currsize == 0
+    
+    def test_validate_addresses_batches_bedrock_questions(self):
+        """Test that all component comparisons across address pairs share one Bedrock call."""
+        import io
+        import rules
+        rules._bedrock_yes_no.cache_clear()
+        bedrock = Mock()
+        bedrock.invoke_model.return_value = {
+            'body': io.BytesIO(json.dumps({'content': [{'text': '["YES", "NO", "YES"]'}]}).encode())
+        }
+        addresses = [
+            {'value': '123 Main St, Springfield, IL 62701', 'source': 'doc-1'},
+            {'value': '123 Main Street, Springfeld, IL 62701', 'source': 'doc-2'},
+            {'value': '123 main st, Springfield, Illinois 62701', 'source': 'doc-3'}
+        ]
+        
+        with patch.object(rules, 'get_bedrock_client', return_value=bedrock):
+            inconsistencies = rules.validate_addresses(addresses)
+        
+        # street, city and state questions are deduplicated across the three pairs
+        assert bedrock.invoke_model.call_count == 1
+        assert [inc['source_documents'] for inc in inconsistencies] == [['doc-1', 'doc-2'], ['doc-2', 'doc-3']]
+        assert all('city' in inc['description'] for inc in inconsistencies)
+    
+    def test_semantic_component_match_batch_falls_back_on_malformed_reply(self):
+        """Test that an unparseable batched reply falls back to per-pair checks."""
+        import rules
+        pairs = [('Main St', 'Main Street', 'street'), ('Springfield', 'Springfeld', 'city'),
+                 ('IL', 'il', 'state')]
+        
+        with patch.object(rules, '_invoke_bedrock', return_value='YES'), \
+             patch.object(rules, 'semantic_component_match', side_effect=[True, False]) as single:
+            assert rules.semantic_component_match_batch(pairs) == [True, False, True]
+        
+        assert single.call_count == 2
+    
+    def test_validate_names_keeps_non_latin_names_distinct(self):
+        """Test that accent stripping does not erase non-Latin names."""
+        names = [
+            {'value': '王小明', 'source': 'doc-1'},
+            {'value': '李大华', 'source': 'doc-2'}
+        ]
+        assert len(validate_names(names)) == 1
+    
+    def test_normalize_name_keeps_non_latin_marks(self):
+        """Test that kana voicing marks survive normalization and Hangul stays composed."""
+        import rules
+        assert rules._normalize_name('ガ') != rules._normalize_name('カ')
+        assert rules._normalize_name('ガ') == 'ガ'
+        assert rules._normalize_name('김민준') == '김민준'
+        assert rules._normalize_name('José') == 'jose'
+    
+    def test_handler_with_name_validation(self, doc_factory, handler_event):
         """Test Lambda handler performs name validation and returns inconsistencies."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
         context = {}
         
         # Create mock documents with different names
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            classification_confidence=0.95,
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='TAX_FORM',
-            classification_confidence=0.92,
-            processing_status='COMPLETED',
             extracted_data={
                 'taxpayer_name': {'value': 'Jane Smith', 'confidence': 0.97}
             }
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
-            assert len(response['inconsistencies']) == 1
-            assert response['inconsistencies_found'] == 1
-            
-            # Verify inconsistency details
-            inc = response['inconsistencies'][0]
-            assert inc['field'] == 'name'
-            assert inc['severity'] == 'HIGH'
-            assert inc['expected_value'] == 'John Doe'
-            assert inc['actual_value'] == 'Jane Smith'
-            assert 'doc-1' in inc['source_documents']
-            assert 'doc-2' in inc['source_documents']
+        event = handler_event(mock_doc1, mock_doc2)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
+        assert len(response['inconsistencies']) == 1
+        assert response['inconsistencies_found'] == 1
+        
+        # Verify inconsistency details
+        inc = response['inconsistencies'][0]
+        assert inc['field'] == 'name'
+        assert inc['severity'] == 'HIGH'
+        assert inc['expected_value'] == 'John Doe'
+        assert inc['actual_value'] == 'Jane Smith'
+        assert 'doc-1' in inc['source_documents']
+        assert 'doc-2' in inc['source_documents']
     
-    def test_handler_with_matching_names(self):
+    def test_handler_with_matching_names(self, doc_factory, handler_event):
         """Test Lambda handler with matching names returns no inconsistencies."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
         context = {}
         
         # Create mock documents with same names
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            classification_confidence=0.95,
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='tax_form.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='TAX_FORM',
-            classification_confidence=0.92,
-            processing_status='COMPLETED',
             extracted_data={
                 'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97}
             }
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
-            assert len(response['inconsistencies']) == 0
-            assert response['inconsistencies_found'] == 0
+        event = handler_event(mock_doc1, mock_doc2)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
+        assert len(response['inconsistencies']) == 0
+        assert response['inconsistencies_found'] == 0
     
-    def test_handler_extracts_names_from_different_document_types(self):
+    def test_handler_extracts_names_from_different_document_types(self, doc_factory, handler_event):
         """Test handler extracts names from all document types."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2', 'doc-3', 'doc-4', 'doc-5']
-        }
         context = {}
         
         # Create mock documents of different types
         mock_docs = [
-            DocumentMetadata(
+            doc_factory(
                 document_id='doc-1',
-                loan_application_id='loan-123',
-                s3_bucket='test-bucket',
-                s3_key='test/doc1.pdf',
-                upload_timestamp='2024-01-15T10:00:00Z',
-                file_name='w2.pdf',
-                file_size_bytes=1024,
-                file_format='PDF',
-                checksum='abc123',
                 document_type='W2',
-                processing_status='COMPLETED',
                 extracted_data={'employee_name': {'value': 'John Doe', 'confidence': 0.98}}
             ),
-            DocumentMetadata(
+            doc_factory(
                 document_id='doc-2',
-                loan_application_id='loan-123',
-                s3_bucket='test-bucket',
-                s3_key='test/doc2.pdf',
-                upload_timestamp='2024-01-15T10:01:00Z',
-                file_name='bank.pdf',
-                file_size_bytes=1024,
-                file_format='PDF',
-                checksum='def456',
                 document_type='BANK_STATEMENT',
-                processing_status='COMPLETED',
                 extracted_data={'account_holder_name': {'value': 'John Doe', 'confidence': 0.97}}
             ),
-            DocumentMetadata(
+            doc_factory(
                 document_id='doc-3',
-                loan_application_id='loan-123',
-                s3_bucket='test-bucket',
-                s3_key='test/doc3.pdf',
-                upload_timestamp='2024-01-15T10:02:00Z',
-                file_name='tax.pdf',
-                file_size_bytes=1024,
-                file_format='PDF',
-                checksum='ghi789',
                 document_type='TAX_FORM',
-                processing_status='COMPLETED',
                 extracted_data={'taxpayer_name': {'value': 'John Doe', 'confidence': 0.96}}
             ),
-            DocumentMetadata(
+            doc_factory(
                 document_id='doc-4',
-                loan_application_id='loan-123',
-                s3_bucket='test-bucket',
-                s3_key='test/doc4.pdf',
-                upload_timestamp='2024-01-15T10:03:00Z',
-                file_name='license.pdf',
-                file_size_bytes=1024,
-                file_format='PDF',
-                checksum='jkl012',
                 document_type='DRIVERS_LICENSE',
-                processing_status='COMPLETED',
                 extracted_data={'full_name': {'value': 'John Doe', 'confidence': 0.99}}
             ),
-            DocumentMetadata(
+            doc_factory(
                 document_id='doc-5',
-                loan_application_id='loan-123',
-                s3_bucket='test-bucket',
-                s3_key='test/doc5.pdf',
-                upload_timestamp='2024-01-15T10:04:00Z',
-                file_name='id.pdf',
-                file_size_bytes=1024,
-                file_format='PDF',
-                checksum='mno345',
                 document_type='ID_DOCUMENT',
-                processing_status='COMPLETED',
                 extracted_data={'full_name': {'value': 'John Doe', 'confidence': 0.98}}
             )
         ]
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = mock_docs
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert len(response['documents']) == 5
-            # All names match, so no inconsistencies
-            assert len(response['inconsistencies']) == 0
+        event = handler_event(*mock_docs)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert len(response['documents']) == 5
+        # All names match, so no inconsistencies
+        assert len(response['inconsistencies']) == 0
 
 
 
 class TestGoldenRecordGeneration:
     """Test suite for Task 8.7: Golden Record generation logic."""
     
-    def test_generate_golden_record_basic(self):
+    def test_generate_golden_record_basic(self, doc_factory):
         """Test Golden Record generation with basic document set."""
         from rules import generate_golden_record
         
@@ -780,18 +706,9 @@ class TestGoldenRecordGeneration:
         created_timestamp = '2024-01-15T10:00:00Z'
         
         # Create mock documents
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98},
                 'employee_ssn': {'value': '***-**-1234', 'confidence': 0.99},
@@ -802,18 +719,9 @@ class TestGoldenRecordGeneration:
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='license.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='DRIVERS_LICENSE',
-            processing_status='COMPLETED',
             extracted_data={
                 'full_name': {'value': 'John Doe', 'confidence': 0.99},
                 'date_of_birth': {'value': '1985-06-15', 'confidence': 0.99},
@@ -867,7 +775,7 @@ class TestGoldenRecordGeneration:
         assert 'drivers_license_state' in golden_record
         assert golden_record['drivers_license_state']['value'] == 'IL'
     
-    def test_generate_golden_record_reliability_hierarchy(self):
+    def test_generate_golden_record_reliability_hierarchy(self, doc_factory):
         """Test that Golden Record respects reliability hierarchy."""
         from rules import generate_golden_record
         
@@ -876,52 +784,25 @@ class TestGoldenRecordGeneration:
         created_timestamp = '2024-01-15T10:00:00Z'
         
         # Create documents with same field but different reliability
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='bank.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='BANK_STATEMENT',  # Reliability = 1
-            processing_status='COMPLETED',
             extracted_data={
                 'account_holder_name': {'value': 'John Doe', 'confidence': 0.99}  # High confidence
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='W2',  # Reliability = 2
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.90}  # Lower confidence
             }
         )
         
-        mock_doc3 = DocumentMetadata(
+        mock_doc3 = doc_factory(
             document_id='doc-3',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc3.pdf',
-            upload_timestamp='2024-01-15T10:10:00Z',
-            file_name='license.pdf',
-            file_size_bytes=3072,
-            file_format='PDF',
-            checksum='ghi789',
             document_type='DRIVERS_LICENSE',  # Reliability = 4
-            processing_status='COMPLETED',
             extracted_data={
                 'full_name': {'value': 'John Doe', 'confidence': 0.85}  # Lowest confidence
             }
@@ -937,7 +818,7 @@ class TestGoldenRecordGeneration:
         assert golden_record['name']['confidence'] == 0.85
         assert golden_record['name']['value'] == 'John Doe'
     
-    def test_generate_golden_record_confidence_tiebreaker(self):
+    def test_generate_golden_record_confidence_tiebreaker(self, doc_factory):
         """Test that confidence is used as tiebreaker when reliability is equal."""
         from rules import generate_golden_record
         
@@ -946,35 +827,17 @@ class TestGoldenRecordGeneration:
         created_timestamp = '2024-01-15T10:00:00Z'
         
         # Create two documents with same reliability but different confidence
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='license1.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='DRIVERS_LICENSE',  # Reliability = 4
-            processing_status='COMPLETED',
             extracted_data={
                 'full_name': {'value': 'John Doe', 'confidence': 0.95}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='id.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='ID_DOCUMENT',  # Reliability = 4 (same as DRIVERS_LICENSE)
-            processing_status='COMPLETED',
             extracted_data={
                 'full_name': {'value': 'John Doe', 'confidence': 0.99}  # Higher confidence
             }
@@ -989,7 +852,7 @@ class TestGoldenRecordGeneration:
         assert golden_record['name']['source_document'] == 'doc-2'
         assert golden_record['name']['confidence'] == 0.99
     
-    def test_generate_golden_record_alternative_values(self):
+    def test_generate_golden_record_alternative_values(self, doc_factory):
         """Test that alternative values are stored when different values exist."""
         from rules import generate_golden_record
         
@@ -998,35 +861,17 @@ class TestGoldenRecordGeneration:
         created_timestamp = '2024-01-15T10:00:00Z'
         
         # Create documents with different name values
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='license.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='DRIVERS_LICENSE',
-            processing_status='COMPLETED',
             extracted_data={
                 'full_name': {'value': 'John Doe', 'confidence': 0.99}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='W2',
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'Jon Doe', 'confidence': 0.95}  # Different value
             }
@@ -1043,7 +888,7 @@ class TestGoldenRecordGeneration:
         assert 'alternative_values' in golden_record['name']
         assert 'Jon Doe' in golden_record['name']['alternative_values']
     
-    def test_generate_golden_record_verified_by(self):
+    def test_generate_golden_record_verified_by(self, doc_factory):
         """Test that verified_by tracks documents with same value."""
         from rules import generate_golden_record
         
@@ -1052,52 +897,25 @@ class TestGoldenRecordGeneration:
         created_timestamp = '2024-01-15T10:00:00Z'
         
         # Create documents with same name value
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='license.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='DRIVERS_LICENSE',
-            processing_status='COMPLETED',
             extracted_data={
                 'full_name': {'value': 'John Doe', 'confidence': 0.99}
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='W2',
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.95}  # Same value
             }
         )
         
-        mock_doc3 = DocumentMetadata(
+        mock_doc3 = doc_factory(
             document_id='doc-3',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc3.pdf',
-            upload_timestamp='2024-01-15T10:10:00Z',
-            file_name='tax.pdf',
-            file_size_bytes=3072,
-            file_format='PDF',
-            checksum='ghi789',
             document_type='TAX_FORM',
-            processing_status='COMPLETED',
             extracted_data={
                 'taxpayer_name': {'value': 'John Doe', 'confidence': 0.97}  # Same value
             }
@@ -1134,7 +952,7 @@ class TestGoldenRecordGeneration:
         # Should only have the required fields
         assert len(golden_record) == 2
     
-    def test_generate_golden_record_missing_fields(self):
+    def test_generate_golden_record_missing_fields(self, doc_factory):
         """Test Golden Record generation when documents have missing fields."""
         from rules import generate_golden_record
         
@@ -1143,18 +961,9 @@ class TestGoldenRecordGeneration:
         created_timestamp = '2024-01-15T10:00:00Z'
         
         # Create document with only some fields
-        mock_doc = DocumentMetadata(
+        mock_doc = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98}
                 # Missing other fields
@@ -1173,29 +982,15 @@ class TestGoldenRecordGeneration:
         assert 'ssn' not in golden_record
         assert 'date_of_birth' not in golden_record
     
-    def test_handler_includes_golden_record_in_response(self):
+    def test_handler_includes_golden_record_in_response(self, doc_factory, handler_event):
         """Test that Lambda handler includes Golden Record in response."""
         # Arrange
-        event = {
-            'loan_application_id': 'loan-123',
-            'document_ids': ['doc-1', 'doc-2']
-        }
         context = {}
         
         # Create mock documents
-        mock_doc1 = DocumentMetadata(
+        mock_doc1 = doc_factory(
             document_id='doc-1',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc1.pdf',
-            upload_timestamp='2024-01-15T10:00:00Z',
-            file_name='w2.pdf',
-            file_size_bytes=1024,
-            file_format='PDF',
-            checksum='abc123',
             document_type='W2',
-            classification_confidence=0.95,
-            processing_status='COMPLETED',
             extracted_data={
                 'employee_name': {'value': 'John Doe', 'confidence': 0.98},
                 'employee_ssn': {'value': '***-**-1234', 'confidence': 0.99},
@@ -1203,51 +998,37 @@ class TestGoldenRecordGeneration:
             }
         )
         
-        mock_doc2 = DocumentMetadata(
+        mock_doc2 = doc_factory(
             document_id='doc-2',
-            loan_application_id='loan-123',
-            s3_bucket='test-bucket',
-            s3_key='test/doc2.pdf',
-            upload_timestamp='2024-01-15T10:05:00Z',
-            file_name='license.pdf',
-            file_size_bytes=2048,
-            file_format='PDF',
-            checksum='def456',
             document_type='DRIVERS_LICENSE',
-            classification_confidence=0.92,
-            processing_status='COMPLETED',
             extracted_data={
                 'full_name': {'value': 'John Doe', 'confidence': 0.99},
                 'date_of_birth': {'value': '1985-06-15', 'confidence': 0.99}
             }
         )
         
-        # Mock DocumentRepository
-        with patch('repositories.DocumentRepository') as mock_repo_class:
-            mock_repo = Mock()
-            mock_repo.get_document.side_effect = [mock_doc1, mock_doc2]
-            mock_repo_class.return_value = mock_repo
-            
-            # Act
-            response = lambda_handler(event, context)
-            
-            # Assert
-            assert response['statusCode'] == 200
-            assert 'golden_record' in response
-            assert response['golden_record']['loan_application_id'] == 'loan-123'
-            assert 'created_timestamp' in response['golden_record']
-            
-            # Verify Golden Record has consolidated data
-            assert 'name' in response['golden_record']
-            assert response['golden_record']['name']['value'] == 'John Doe'
-            # Name should come from DRIVERS_LICENSE (higher reliability)
-            assert response['golden_record']['name']['source_document'] == 'doc-2'
-            
-            assert 'ssn' in response['golden_record']
-            assert response['golden_record']['ssn']['value'] == '***-**-1234'
-            
-            assert 'date_of_birth' in response['golden_record']
-            assert response['golden_record']['date_of_birth']['value'] == '1985-06-15'
-            
-            # Verify validation status updated
-            assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
+        event = handler_event(mock_doc1, mock_doc2)
+        
+        # Act
+        response = lambda_handler(event, context)
+        
+        # Assert
+        assert response['statusCode'] == 200
+        assert 'golden_record' in response
+        assert response['golden_record']['loan_application_id'] == 'loan-123'
+        assert 'created_timestamp' in response['golden_record']
+        
+        # Verify Golden Record has consolidated data
+        assert 'name' in response['golden_record']
+        assert response['golden_record']['name']['value'] == 'John Doe'
+        # Name should come from DRIVERS_LICENSE (higher reliability)
+        assert response['golden_record']['name']['source_document'] == 'doc-2'
+        
+        assert 'ssn' in response['golden_record']
+        assert response['golden_record']['ssn']['value'] == '***-**-1234'
+        
+        assert 'date_of_birth' in response['golden_record']
+        assert response['golden_record']['date_of_birth']['value'] == '1985-06-15'
+        
+        # Verify validation status updated
+        assert response['validation_status'] == 'VALIDATION_COMPLETE_WITH_GOLDEN_RECORD'
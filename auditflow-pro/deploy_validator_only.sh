@@ -38,6 +38,13 @@ if [ ! -f "$TEMP_DIR/shared/__init__.py" ]; then
     echo "# Shared modules package" > "$TEMP_DIR/shared/__init__.py"
 fi
 
+# Vendor the validator's third-party wheels (rapidfuzz) for the arm64 runtime
+if [ -f requirements.txt ]; then
+    echo "  Installing validator dependencies..."
+    pip install -q -r requirements.txt --target "$TEMP_DIR" \
+        --platform manylinux2014_aarch64 --python-version 3.10 --implementation cp --only-binary=:all:
+fi
+
 # Create the zip from the temp directory
 echo "Step 4: Creating zip file..."
 cd "$TEMP_DIR"
@@ -55,6 +62,7 @@ cd "$SCRIPT_DIR/backend/functions/validator"
 echo "Step 6: Uploading to Lambda..."
 aws lambda update-function-code \
     --function-name "$FUNCTION_NAME" \
+    --architectures arm64 \
     --zip-file fileb://deployment_package.zip \
     --region "$REGION" \
     --output json > /dev/null
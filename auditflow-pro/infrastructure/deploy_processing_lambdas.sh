@@ -32,9 +32,11 @@ deploy_lambda() {
     local DESCRIPTION=$4
     local TIMEOUT=${5:-300}
     local MEMORY=${6:-512}
+    local ARCH=${7:-x86_64}
     
     echo "Deploying $FUNCTION_NAME..."
     echo "  Directory: $FUNCTION_DIR"
+    echo "  Architecture: $ARCH"
     
     cd "$PROJECT_ROOT/$FUNCTION_DIR"
     
@@ -46,6 +48,20 @@ deploy_lambda() {
     # Package function code
     zip -q deployment_package.zip *.py 2>/dev/null || true
     
+    # Vendor third-party wheels listed in the function's requirements.txt
+    if [ -f "requirements.txt" ]; then
+        echo "  Installing dependencies..."
+        local BUILD_DIR=$(mktemp -d)
+        local PLATFORM="manylinux2014_x86_64"
+        if [ "$ARCH" = "arm64" ]; then
+            PLATFORM="manylinux2014_aarch64"
+        fi
+        pip install -q -r requirements.txt --target "$BUILD_DIR" \
+            --platform $PLATFORM --python-version 3.10 --implementation cp --only-binary=:all:
+        (cd "$BUILD_DIR" && zip -qr "$PROJECT_ROOT/$FUNCTION_DIR/deployment_package.zip" .)
+        rm -rf "$BUILD_DIR"
+    fi
+    
     # Add shared modules to the package
     if [ -d "$PROJECT_ROOT/backend/shared" ]; then
         echo "  Adding shared modules..."
@@ -59,6 +75,7 @@ deploy_lambda() {
         echo "  Updating existing function..."
         aws lambda update-function-code \
             --function-name $FUNCTION_NAME \
+            --architectures $ARCH \
             --zip-file fileb://deployment_package.zip > /dev/null
         
         aws lambda wait function-updated --function-name $FUNCTION_NAME
@@ -75,6 +92,7 @@ deploy_lambda() {
         aws lambda create-function \
             --function-name $FUNCTION_NAME \
             --runtime python3.10 \
+            --architectures $ARCH \
             --role $ROLE_ARN \
             --handler $HANDLER \
             --zip-file fileb://deployment_package.zip \
@@ -92,7 +110,8 @@ deploy_lambda() {
 # Deploy all processing Lambdas
 deploy_lambda "AuditFlow-Classifier" "backend/functions/classifier" "app.lambda_handler" "Document classification Lambda" 300 512
 deploy_lambda "AuditFlow-Extractor" "backend/functions/extractor" "app.lambda_handler" "Data extraction Lambda" 300 1024
-deploy_lambda "AuditFlow-Validator" "backend/functions/validator" "app.lambda_handler" "Data validation Lambda" 300 512
+# The validator runs on Graviton (arm64); its rapidfuzz wheel is installed for manylinux2014_aarch64.
+deploy_lambda "AuditFlow-Validator" "backend/functions/validator" "app.lambda_handler" "Data validation Lambda" 300 512 arm64
 deploy_lambda "AuditFlow-RiskScorer" "backend/functions/risk_scorer" "app.lambda_handler" "Risk scoring Lambda" 300 512
 deploy_lambda "AuditFlow-Reporter" "backend/functions/reporter" "app.lambda_handler" "Report generation Lambda" 300 1024
 
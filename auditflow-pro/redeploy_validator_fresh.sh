@@ -55,6 +55,13 @@ if [ ! -f "$TEMP_DIR/shared/__init__.py" ]; then
     echo "# Shared modules package" > "$TEMP_DIR/shared/__init__.py"
 fi
 
+# Vendor the validator's third-party wheels (rapidfuzz) for the arm64 runtime
+if [ -f requirements.txt ]; then
+    echo "  Installing validator dependencies..."
+    pip install -q -r requirements.txt --target "$TEMP_DIR" \
+        --platform manylinux2014_aarch64 --python-version 3.10 --implementation cp --only-binary=:all:
+fi
+
 # Create zip
 cd "$TEMP_DIR"
 zip -r "$SCRIPT_DIR/backend/functions/validator/deployment_package.zip" . -q
@@ -69,6 +76,7 @@ cd "$SCRIPT_DIR/backend/functions/validator"
 aws lambda create-function \
     --function-name "$FUNCTION_NAME" \
     --runtime python3.10 \
+    --architectures arm64 \
     --role "$ROLE_ARN" \
     --handler app.lambda_handler \
     --zip-file fileb://deployment_package.zip \